@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+単体テストケースExcel生成のベンチマークスクリプト
+
+--suite style: セルのスタイル設定方法ごとに、1セルあたりの処理時間を計測する。
+--suite scale: 1千〜100万行の合成カタログを作り、書き出し方式ごとの処理時間・
+               最大メモリ使用量（RSS）・出力サイズを計測して、保存済みの基準値と比較する。
+               基準値から閾値を超えて悪化した項目や、基準値のない項目があれば終了コード1で終了する。
+               --sizes の既定は基準値を保存してある1千・1万行（10万・100万行は指定したときだけ計測する）。
+
+基準値の処理時間と最大RSSは、保存したマシンでの絶対値（正規化はしていない）。
+リポジトリの benchmark_baseline.json は1台のマシンで計測した参考値のため、比較に使うマシンで
+最初に --save-baseline を付けて保存し直し、以降は同じマシンの結果どうしを比較する。
+
+    python benchmark_test_cases.py --suite scale --sizes 1k 10k --save-baseline
+    python benchmark_test_cases.py --suite scale --sizes 1k 10k --threshold 0.2
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from openpyxl import Workbook
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+
+from generate_test_cases import (
+    create_test_cases_excel,
+    create_test_cases_excel_cached,
+    create_test_cases_excel_parallel,
+)
+from testcases.cache import SheetCache
+from testcases.catalog import HEADERS, dump_sheet, list_sheets, select_sheets
+from testcases.styles import CENTER_COLUMNS, CENTER_STYLE, HEADER_STYLE, LEFT_STYLE, register_named_styles
+
+BASELINE_PATH = Path(__file__).resolve().parent / "benchmark_baseline.json"
+
+# 合成カタログの行数（10シートに均等に割り振る）
+SCALE_SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+# --sizes を省略したときに計測する行数（benchmark_baseline.json に基準値があるもの）
+DEFAULT_SIZES = ["1k", "10k"]
+
+# 基準値からの悪化をどこまで許すか（0.2 = 20%）
+DEFAULT_THRESHOLD = 0.2
+
+# 比較する計測項目
+METRICS = ("seconds", "peak_rss_bytes", "output_bytes")
+
+SAMPLE_ROW = ["", "メールアドレス未入力", "単項目", "なし",
+              "email: 空, password: 'test123', name: 'テスト太郎'",
+              "エラー: メールアドレス、パスワード、名前は必須です", ""]
+
+def synthetic_test_cases(rows):
+    """ベンチマーク用のテストケースを生成"""
+    for no in range(1, rows + 1):
+        row = list(SAMPLE_ROW)
+        row[0] = str(no)
+        yield row
+
+def style_per_attribute(ws, test_cases):
+    """変更前の方式: セルごとに border / alignment / fill / font を個別に設定"""
+    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    header_font = Font(bold=True, color="FFFFFF", size=11)
+    border = Border(
+        left=Side(style='thin'),
+        right=Side(style='thin'),
+        top=Side(style='thin'),
+        bottom=Side(style='thin')
+    )
+    center_alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
+    left_alignment = Alignment(horizontal='left', vertical='top', wrap_text=True)
+
+    ws.append(HEADERS)
+    for col_num in range(1, len(HEADERS) + 1):
+        cell = ws.cell(row=1, column=col_num)
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.alignment = center_alignment
+        cell.border = border
+
+    for row_num, test_case in enumerate(test_cases, 2):
+        for col_num, value in enumerate(test_case, 1):
+            cell = ws.cell(row=row_num, column=col_num)
+            cell.value = value
+            cell.border = border
+            if col_num in CENTER_COLUMNS:
+                cell.alignment = center_alignment
+            else:
+                cell.alignment = left_alignment
+
+def style_named(ws, test_cases):
+    """変更後の方式: 登録済みの名前付きスタイルをセルごとに1回で適用"""
+    register_named_styles(ws.parent)
+
+    ws.append(HEADERS)
+    for cell in ws[1]:
+        cell.style = HEADER_STYLE
+
+    for row_num, test_case in enumerate(test_cases, 2):
+        for col_num, value in enumerate(test_case, 1):
+            cell = ws.cell(row=row_num, column=col_num, value=value)
+            cell.style = CENTER_STYLE if col_num in CENTER_COLUMNS else LEFT_STYLE
+
+STYLE_BENCHMARKS = [
+    ("セル属性ごと（変更前）", style_per_attribute),
+    ("名前付きスタイル（変更後）", style_named),
+]
+
+def run_style_benchmark(rows):
+    """スタイル設定方式ごとの1セルあたりのコストを計測して表示"""
+    cells = (rows + 1) * len(HEADERS)
+    print(f"テストケース {rows:,} 行（{cells:,} セル）")
+    for label, style_sheet in STYLE_BENCHMARKS:
+        wb = Workbook()
+        ws = wb.active
+        start = time.perf_counter()
+        style_sheet(ws, synthetic_test_cases(rows))
+        elapsed = time.perf_counter() - start
+        print(f"  {label}: {elapsed:.2f} 秒, {elapsed / cells * 1e6:.2f} µs/セル")
+
+# 書き出し方式（計測は方式ごとに別プロセスで行う）
+WRITER_MODES = {
+    "normal": lambda filename, sheets: create_test_cases_excel(filename, sheets=sheets),
+    "streaming": lambda filename, sheets: create_test_cases_excel(filename, streaming=True, sheets=sheets),
+    "parallel": lambda filename, sheets: create_test_cases_excel_parallel(filename, sheets=sheets),
+    # オプションなしで実行したときの方式（空のキャッシュから全シートを書き出す）
+    "cached": lambda filename, sheets: create_test_cases_excel_cached(
+        filename, sheets=sheets, cache=SheetCache(os.path.join(os.path.dirname(filename), "cache"))),
+}
+
+def write_synthetic_catalog(catalog_dir, rows):
+    """実際のカタログのシート名と行を元に、rows 行の合成カタログを書き出す
+
+    文字列の長さが実際のテストケースと同程度になるよう、既存の行を繰り返し使い、
+    テスト項目に連番を付けて行ごとに内容を変える。
+    """
+    sheets = list_sheets()
+    templates = [test_case for sheet in sheets for test_case in sheet.test_cases()]
+    per_sheet, extra = divmod(rows, len(sheets))
+    offset = 0
+    for idx, sheet in enumerate(sheets):
+        count = per_sheet + (1 if idx < extra else 0)
+        test_cases = []
+        for no in range(1, count + 1):
+            row = list(templates[(offset + no) % len(templates)])
+            row[0] = str(no)
+            row[1] = f"{row[1]}（{no}）"
+            test_cases.append(row)
+        offset += count
+        data = {"title": sheet.title, "description": sheet.description,
+                "groups": [{"name": "合成データ", "test_cases": test_cases}]}
+        with open(Path(catalog_dir) / sheet.path.name, "w", encoding="utf-8") as f:
+            dump_sheet(data, f)
+
+def run_writer(mode, catalog_dir, filename):
+    """（子プロセス）1つの書き出し方式を実行し、処理時間をJSONで標準出力に書く"""
+    sheets = select_sheets(catalog_dir=catalog_dir)
+    start = time.perf_counter()
+    WRITER_MODES[mode](filename, sheets)
+    print(json.dumps({"seconds": time.perf_counter() - start}))
+
+def measure_writer(mode, catalog_dir, filename):
+    """書き出し方式を別プロセスで実行し、処理時間・最大RSS・出力サイズを返す"""
+    process = subprocess.Popen(
+        [sys.executable, __file__, "--run-writer", mode, str(catalog_dir), filename],
+        stdout=subprocess.PIPE, text=True)
+    with process.stdout:
+        output = process.stdout.read()
+    # 子プロセスの最大RSSを得るため wait4 で回収する（Linuxは KB、macOSはバイト単位）
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode != 0:
+        raise RuntimeError(f"{mode} の実行に失敗しました（終了コード {process.returncode}）")
+    peak_rss = usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+    return {
+        "seconds": json.loads(output.strip().splitlines()[-1])["seconds"],
+        "peak_rss_bytes": peak_rss,
+        "output_bytes": os.path.getsize(filename),
+    }
+
+def run_scale_benchmark(sizes, modes):
+    """合成カタログの行数と書き出し方式の組み合わせごとに計測して表示し、結果を返す"""
+    results = {}
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            catalog_dir = Path(tmpdir) / "sheets"
+            catalog_dir.mkdir()
+            write_synthetic_catalog(catalog_dir, SCALE_SIZES[size])
+            print(f"テストケース {SCALE_SIZES[size]:,} 行")
+            for mode in modes:
+                result = measure_writer(mode, catalog_dir, os.path.join(tmpdir, f"{mode}.xlsx"))
+                results[f"{size}/{mode}"] = result
+                print(f"  {mode}: {result['seconds']:.2f} 秒, "
+                      f"最大RSS {result['peak_rss_bytes'] / 1024 / 1024:.1f} MB, "
+                      f"出力 {result['output_bytes'] / 1024 / 1024:.2f} MB")
+    return results
+
+def compare_with_baseline(results, baseline, threshold):
+    """基準値から threshold を超えて悪化した項目と、基準値のない項目を返す"""
+    regressions = []
+    missing = []
+    for key, result in results.items():
+        if key not in baseline:
+            missing.append(key)
+            continue
+        for metric in METRICS:
+            base = baseline[key][metric]
+            if base and result[metric] > base * (1 + threshold):
+                regressions.append(f"{key} {metric}: {base:,.2f} -> {result[metric]:,.2f} "
+                                   f"(+{(result[metric] / base - 1) * 100:.1f}%)")
+    return regressions, missing
+
+def main():
+    parser = argparse.ArgumentParser(description="テストケース生成のベンチマークを実行します")
+    parser.add_argument("--suite", choices=("style", "scale"), default="style", help="実行するベンチマーク")
+    parser.add_argument("--rows", type=int, default=100_000, help="生成するテストケースの行数（style）")
+    parser.add_argument("--sizes", nargs="+", choices=SCALE_SIZES, default=DEFAULT_SIZES,
+                        help=f"合成カタログの行数（scale、既定は {' '.join(DEFAULT_SIZES)}）")
+    parser.add_argument("--modes", nargs="+", choices=WRITER_MODES, default=list(WRITER_MODES),
+                        help="計測する書き出し方式（scale）")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="基準値のJSONファイル（scale）")
+    parser.add_argument("--save-baseline", action="store_true", help="今回の結果を基準値として保存する（scale）")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="基準値からの悪化の許容割合（scale、0.2 = 20%%）")
+    parser.add_argument("--run-writer", nargs=3, metavar=("MODE", "CATALOG", "OUTPUT"),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_writer:
+        run_writer(*args.run_writer)
+        return
+    if args.suite == "style":
+        run_style_benchmark(args.rows)
+        return
+
+    results = run_scale_benchmark(args.sizes, args.modes)
+    baseline_path = Path(args.baseline)
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8")) if baseline_path.exists() else {}
+
+    if args.save_baseline:
+        baseline.update(results)
+        baseline_path.write_text(json.dumps(baseline, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"✅ 基準値を保存しました: {baseline_path}")
+        return
+    if not baseline:
+        print(f"❌ 基準値がないため比較できません（--save-baseline で保存してください）: {baseline_path}")
+        sys.exit(1)
+
+    regressions, missing = compare_with_baseline(results, baseline, args.threshold)
+    if missing:
+        print(f"❌ 基準値のない項目があります（--save-baseline で追加してください）: {', '.join(missing)}")
+    if regressions:
+        print(f"❌ 基準値から {args.threshold * 100:.0f}% を超えて悪化しました:")
+        for regression in regressions:
+            print(f"  {regression}")
+        print("  （基準値は保存したマシンでの値です。別のマシンでは先に --save-baseline で保存し直してください）")
+    if missing or regressions:
+        sys.exit(1)
+    print(f"✅ 基準値からの悪化はありません（閾値 {args.threshold * 100:.0f}%）")
+
+if __name__ == "__main__":
+    main()
@@ -4,575 +4,529 @@
 単体テストケースExcel生成スクリプト
 """
 
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
+
 try:
+    import openpyxl
     from openpyxl import Workbook
-    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-    from openpyxl.utils import get_column_letter
+    from openpyxl.xml.functions import tostring
 except ImportError:
     print("openpyxlがインストールされていません。以下のコマンドでインストールしてください:")
     print("pip install openpyxl")
     exit(1)
 
-def create_test_cases_excel():
-    """テストケースExcelファイルを作成"""
+from testcases.cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, SheetCache
+from testcases.catalog import CATALOG_DIR, HEADERS, CatalogSheet, select_sheets
+from testcases.exporters import EXPORTERS, export_test_cases
+from testcases.profiling import NULL_PROFILER, Profiler
+from testcases.routes import API_DIR, route_path
+from testcases.schema import SCHEMA_PATH
+from testcases.shards import plan_shards, shard_filename
+from testcases.styles import (
+    CENTER_COLUMNS,
+    CENTER_STYLE,
+    HEADER_STYLE,
+    LEFT_STYLE,
+    register_named_styles,
+    set_column_widths,
+)
+from testcases.watch import FileWatcher
+from testcases.writer import OUTPUT_FILENAME, create_test_cases_excel, write_sheet_streaming
+from testcases.widths import MAX_COLUMN_WIDTH, MIN_COLUMN_WIDTH, WIDTH_PADDING, ColumnSizer, replace_cols_xml
+
+# 結合したワークブックに記録する作成・更新日時（zip のタイムスタンプと同じ固定値）
+FIXED_TIMESTAMP = datetime.datetime(1980, 1, 1)
+
+# 分割したときの索引の見出し
+SHARD_INDEX_HEADERS = ["ファイル", "シート", "元のシート", "No（開始）", "No（終了）", "行数"]
+
+def create_test_cases_excel_parallel(filename=OUTPUT_FILENAME, sheets=None, jobs=None,
+                                     profiler=NULL_PROFILER):
+    """シートごとに別プロセスで書き出し、宣言順に1つのワークブックへ結合する
+
+    各ワーカーは書き込み専用モードでシート1枚分のXMLを生成する。
+    セルスタイルのIDは register_named_styles で固定しているため、
+    結合結果はワーカー数に関わらず同じになる。
+    """
+    if sheets is None:
+        sheets = select_sheets()
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with profiler.phase("シート生成"):
+            sheet_xml_paths = render_sheets(sheets, tmpdir, jobs, profiler=profiler)
+        with profiler.phase("保存"):
+            assemble_workbook([sheet.title for sheet in sheets], sheet_xml_paths, filename, tmpdir)
+    
+    print(f"✅ テストケースExcelファイルを作成しました（並列: {jobs or os.cpu_count()}プロセス）: {filename}")
+
+def create_test_cases_excel_cached(filename=OUTPUT_FILENAME, sheets=None, jobs=1, cache=None,
+                                   profiler=NULL_PROFILER):
+    """変更のあったシートだけを書き出し、それ以外はキャッシュ済みのシートXMLを使う
+
+    全シートが前回の出力と同じ内容で、出力ファイルも残っている場合は書き込みを省略する。
+    """
+    if sheets is None:
+        sheets = select_sheets()
+    if cache is None:
+        cache = SheetCache()
+    
+    with profiler.phase("キャッシュキー計算"):
+        keys = [sheet_cache_key(sheet) for sheet in sheets]
+    workbook_key = hashlib.sha256("\n".join(keys).encode()).hexdigest()
+    if cache.is_output_current(filename, workbook_key):
+        print(f"✅ テストケースに変更はありません: {filename}")
+        return
+    
+    sheet_xml_paths = [cache.get(key) for key in keys]
+    stale = [idx for idx, path in enumerate(sheet_xml_paths) if path is None]
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with profiler.phase("シート生成") as record:
+            rendered = render_sheets([sheets[idx] for idx in stale], tmpdir, jobs, profiler=profiler)
+            for idx, path in zip(stale, rendered):
+                sheet_xml_paths[idx] = cache.put(keys[idx], path)
+            record["sheets"] = len(stale)
+        with profiler.phase("保存"):
+            assemble_workbook([sheet.title for sheet in sheets], sheet_xml_paths, filename, tmpdir)
+    
+    cache.record_output(filename, workbook_key)
+    cache.evict()
+    print(f"✅ テストケースExcelファイルを作成しました（再生成: {len(stale)}/{len(sheets)}シート）: {filename}")
+
+def create_test_cases_excel_sharded(filename=OUTPUT_FILENAME, sheets=None, max_rows=None,
+                                    max_bytes=None, jobs=None, cache=None, profiler=NULL_PROFILER):
+    """シートを行数・バイト数の上限で分割して番号付きのワークブック（シャード）に書き出す
+
+    filename には、各シャードのファイル名・シート名・Noの範囲を並べた索引のワークブックを書き出す。
+    チャンクのシートXMLとシャードの組み立ては jobs プロセスで並列に行う。
+    cache を渡すと、チャンクごとにキャッシュを使い、内容の変わらないシャードは書き込みを省略する。
+    """
+    if sheets is None:
+        sheets = select_sheets()
+    
+    with profiler.phase("分割計画"):
+        shards = plan_shards(sheets, max_rows, max_bytes)
+    shard_files = [shard_filename(filename, number) for number in range(1, len(shards) + 1)]
+    
+    # 書き出すシャードと、そのチャンクのシートXML（キャッシュになければ None）
+    pending = {}
+    with profiler.phase("キャッシュキー計算"):
+        for shard, shard_file in zip(shards, shard_files):
+            if cache is None:
+                pending[shard_file] = (shard, None, None, [None] * len(shard))
+                continue
+            keys = [sheet_cache_key(chunk.sheet, chunk.start, chunk.stop) for chunk in shard]
+            shard_key = hashlib.sha256(
+                "\n".join(f"{chunk.title}\t{key}" for chunk, key in zip(shard, keys)).encode()
+            ).hexdigest()
+            if not cache.is_output_current(shard_file, shard_key):
+                pending[shard_file] = (shard, keys, shard_key, [cache.get(key) for key in keys])
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with profiler.phase("シート生成") as record:
+            stale = [(shard_file, idx) for shard_file, (*_, paths) in pending.items()
+                     for idx, path in enumerate(paths) if path is None]
+            chunks = [pending[shard_file][0][idx] for shard_file, idx in stale]
+            rendered = render_sheets([chunk.sheet for chunk in chunks], tmpdir, jobs,
+                                     [(chunk.start, chunk.stop) for chunk in chunks], profiler)
+            for (shard_file, idx), path in zip(stale, rendered):
+                _, keys, _, paths = pending[shard_file]
+                paths[idx] = path if cache is None else cache.put(keys[idx], path)
+            record["sheets"] = len(stale)
+        with profiler.phase("保存"):
+            tasks = [([chunk.title for chunk in shard], paths, shard_file, tmpdir)
+                     for shard_file, (shard, _, _, paths) in pending.items()]
+            if jobs == 1 or len(tasks) <= 1:
+                for task in tasks:
+                    assemble_shard(task)
+            else:
+                with ProcessPoolExecutor(max_workers=jobs, initializer=tracemalloc.stop) as executor:
+                    list(executor.map(assemble_shard, tasks))
+            # 索引は内容（とスタイル）が前回と同じで、ファイルも残っていれば書き直さない
+            index_rows = shard_index_rows(shards, shard_files)
+            index_key = hashlib.sha256(
+                json.dumps([style_signature(), index_rows], ensure_ascii=False).encode()
+            ).hexdigest()
+            index_current = cache is not None and cache.is_output_current(filename, index_key)
+            if not index_current:
+                write_shard_index(filename, index_rows)
+    
+    if cache is not None:
+        for shard_file, (_, _, shard_key, _) in pending.items():
+            cache.record_output(shard_file, shard_key)
+        cache.record_output(filename, index_key)
+        cache.evict()
+    for shard, shard_file in zip(shards, shard_files):
+        status = "作成" if shard_file in pending else "変更なし"
+        print(f"  {shard_file}: {len(shard)}シート, {sum(chunk.rows for chunk in shard)}行（{status}）")
+    print(f"  {filename}: 索引（{'変更なし' if index_current else '作成'}）")
+    print(f"✅ テストケースExcelファイルを{len(shards)}個に分割して作成しました"
+          f"（再生成: {len(pending)}/{len(shards)}ファイル）: {filename}")
+
+def assemble_shard(task):
+    """ワーカープロセスでシャード1つ分のワークブックを組み立てる"""
+    titles, sheet_xml_paths, filename, tmpdir = task
+    assemble_workbook(titles, sheet_xml_paths, filename, tmpdir)
+    return filename
+
+def shard_index_rows(shards, shard_files):
+    """索引の行（シャードのファイル名・シート名・元のシート名・Noの範囲・行数）"""
+    return [[os.path.basename(shard_file), chunk.title, chunk.sheet.title,
+             chunk.first_no, chunk.last_no, chunk.rows]
+            for shard, shard_file in zip(shards, shard_files) for chunk in shard]
+
+def write_shard_index(filename, index_rows):
+    """シャードごとのシートとNoの範囲を並べた索引のワークブックを書き出す"""
     wb = Workbook()
-    
-    # デフォルトシートを削除
-    if 'Sheet' in wb.sheetnames:
-        wb.remove(wb['Sheet'])
-    
-    # スタイル定義
-    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF", size=11)
-    border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
-    center_alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-    left_alignment = Alignment(horizontal='left', vertical='top', wrap_text=True)
-    
-    # 1. ユーザー登録・ログイン機能
-    ws1 = wb.create_sheet("1. ユーザー登録・ログイン")
-    create_user_auth_sheet(ws1, header_fill, header_font, border, center_alignment, left_alignment)
-    
-    # 2. 商品管理機能
-    ws2 = wb.create_sheet("2. 商品管理")
-    create_product_sheet(ws2, header_fill, header_font, border, center_alignment, left_alignment)
-    
-    # 3. 注文処理機能
-    ws3 = wb.create_sheet("3. 注文処理")
-    create_order_sheet(ws3, header_fill, header_font, border, center_alignment, left_alignment)
-    
-    # 4. スタイリスト申請機能
-    ws4 = wb.create_sheet("4. スタイリスト申請")
-    create_stylist_apply_sheet(ws4, header_fill, header_font, border, center_alignment, left_alignment)
-    
-    # 5. お問い合わせ機能
-    ws5 = wb.create_sheet("5. お問い合わせ")
-    create_inquiry_sheet(ws5, header_fill, header_font, border, center_alignment, left_alignment)
-    
-    # 6. カート・お気に入り機能
-    ws6 = wb.create_sheet("6. カート・お気に入り")
-    create_cart_favorite_sheet(ws6, header_fill, header_font, border, center_alignment, left_alignment)
-    
-    # 7. メルマガ登録機能
-    ws7 = wb.create_sheet("7. メルマガ登録")
-    create_newsletter_sheet(ws7, header_fill, header_font, border, center_alignment, left_alignment)
-    
-    # 8. 管理者機能
-    ws8 = wb.create_sheet("8. 管理者機能")
-    create_admin_sheet(ws8, header_fill, header_font, border, center_alignment, left_alignment)
-    
-    # 9. スタイリスト機能
-    ws9 = wb.create_sheet("9. スタイリスト機能")
-    create_stylist_sheet(ws9, header_fill, header_font, border, center_alignment, left_alignment)
-    
-    # 10. お客様の声機能
-    ws10 = wb.create_sheet("10. お客様の声")
-    create_testimonial_sheet(ws10, header_fill, header_font, border, center_alignment, left_alignment)
-    
-    # ファイル保存
-    filename = "単体テストケース一覧.xlsx"
+    register_named_styles(wb)
+    ws = wb.active
+    ws.title = "索引"
+    
+    ws.append(SHARD_INDEX_HEADERS)
+    for cell in ws[1]:
+        cell.style = HEADER_STYLE
+    
+    sizer = ColumnSizer(SHARD_INDEX_HEADERS)
+    for row_num, values in enumerate(index_rows, 2):
+        sizer.measure(values)
+        for col_num, value in enumerate(values, 1):
+            cell = ws.cell(row=row_num, column=col_num, value=value)
+            cell.style = LEFT_STYLE if col_num <= 3 else CENTER_STYLE
+    
+    set_column_widths(ws, sizer.column_widths())
+    ws.freeze_panes = "A2"
     wb.save(filename)
-    print(f"✅ テストケースExcelファイルを作成しました: {filename}")
 
-def create_user_auth_sheet(ws, header_fill, header_font, border, center_alignment, left_alignment):
-    """ユーザー登録・ログイン機能のテストケース"""
-    headers = ["No", "テスト項目", "テスト種別", "前提条件", "入力データ", "期待結果", "備考"]
-    ws.append(headers)
-    
-    # ヘッダーのスタイル設定
-    for col_num, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col_num)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = center_alignment
-        cell.border = border
-    
-    test_cases = [
-        # ユーザー登録 - 単項目チェック
-        ["1", "メールアドレス未入力", "単項目", "なし", "email: 空, password: 'test123', name: 'テスト太郎'", "エラー: メールアドレス、パスワード、名前は必須です", ""],
-        ["2", "パスワード未入力", "単項目", "なし", "email: 'test@example.com', password: 空, name: 'テスト太郎'", "エラー: メールアドレス、パスワード、名前は必須です", ""],
-        ["3", "名前未入力", "単項目", "なし", "email: 'test@example.com', password: 'test123', name: 空", "エラー: メールアドレス、パスワード、名前は必須です", ""],
-        ["4", "パスワードが6文字未満", "単項目", "なし", "email: 'test@example.com', password: 'test1', name: 'テスト太郎'", "エラー: パスワードは6文字以上である必要があります", ""],
-        ["5", "メールアドレス形式不正", "単項目", "なし", "email: 'invalid-email', password: 'test123', name: 'テスト太郎'", "登録失敗（メールアドレス形式チェック）", "フロントエンドでチェック"],
-        ["6", "正常な登録", "単項目", "なし", "email: 'newuser@example.com', password: 'test123', name: 'テスト太郎'", "ユーザー登録が完了しました", ""],
-        
-        # ユーザー登録 - 相関チェック
-        ["7", "既存メールアドレスで登録", "相関", "メールアドレス 'existing@example.com' が既に登録済み", "email: 'existing@example.com', password: 'test123', name: 'テスト太郎'", "エラー: このメールアドレスは既に登録されています", ""],
-        ["8", "オプション項目ありで登録", "相関", "なし", "email: 'user@example.com', password: 'test123', name: 'テスト太郎', lastName: 'テスト', firstName: '太郎', phone: '090-1234-5678'", "ユーザー登録が完了し、オプション項目も保存される", ""],
-        
-        # ログイン - 単項目チェック
-        ["9", "メールアドレス未入力", "単項目", "なし", "email: 空, password: 'test123'", "エラー: メールアドレスとパスワードを入力してください", ""],
-        ["10", "パスワード未入力", "単項目", "なし", "email: 'test@example.com', password: 空", "エラー: メールアドレスとパスワードを入力してください", ""],
-        ["11", "正常なログイン", "単項目", "ユーザーが登録済み", "email: 'test@example.com', password: 'test123'", "ログインに成功しました", ""],
-        
-        # ログイン - 相関チェック
-        ["12", "存在しないメールアドレス", "相関", "なし", "email: 'nonexistent@example.com', password: 'test123'", "エラー: メールアドレスまたはパスワードが正しくありません", ""],
-        ["13", "間違ったパスワード", "相関", "ユーザーが登録済み（パスワード: 'test123'）", "email: 'test@example.com', password: 'wrongpass'", "エラー: メールアドレスまたはパスワードが正しくありません", ""],
-        ["14", "一時停止ユーザーのログイン", "相関", "ユーザーが一時停止状態（isSuspended: true）", "email: 'suspended@example.com', password: 'test123'", "ログイン拒否（要確認）", "実装状況により異なる"],
-    ]
-    
-    for row_num, test_case in enumerate(test_cases, 2):
-        for col_num, value in enumerate(test_case, 1):
-            cell = ws.cell(row=row_num, column=col_num)
-            cell.value = value
-            cell.border = border
-            if col_num in [1, 3]:  # No, テスト種別
-                cell.alignment = center_alignment
-            else:
-                cell.alignment = left_alignment
-    
-    # 列幅調整
-    ws.column_dimensions['A'].width = 5
-    ws.column_dimensions['B'].width = 25
-    ws.column_dimensions['C'].width = 12
-    ws.column_dimensions['D'].width = 20
-    ws.column_dimensions['E'].width = 40
-    ws.column_dimensions['F'].width = 40
-    ws.column_dimensions['G'].width = 20
+class IncrementalWorkbook:
+    """生成に使うカタログ・スタイル・シートXMLをメモリ（一時ディレクトリ）に保持し、
+    変更のあったシートだけを書き出し直してワークブックを組み立てる（--watch 用）"""
 
-def create_product_sheet(ws, header_fill, header_font, border, center_alignment, left_alignment):
-    """商品管理機能のテストケース"""
-    headers = ["No", "テスト項目", "テスト種別", "前提条件", "入力データ", "期待結果", "備考"]
-    ws.append(headers)
-    
-    for col_num, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col_num)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = center_alignment
-        cell.border = border
-    
-    test_cases = [
-        # 商品取得
-        ["1", "商品一覧取得", "単項目", "なし", "GET /api/products", "全商品の一覧が取得できる", ""],
-        ["2", "商品詳細取得（有効なslug）", "単項目", "商品が存在", "GET /api/products/slug/valid-slug", "商品詳細が取得できる", ""],
-        ["3", "商品詳細取得（存在しないslug）", "単項目", "なし", "GET /api/products/slug/invalid-slug", "404エラーまたは空の結果", ""],
+    def __init__(self, filename=OUTPUT_FILENAME, catalog_dir=CATALOG_DIR, names=None):
+        self.filename = filename
+        self.catalog_dir = catalog_dir
+        self.names = names
+        self.tmpdir = tempfile.mkdtemp(prefix="testcases-watch-")
+        self.sheets = []
+        self.keys = {}
+        self.sheet_xml_paths = {}
+        self.assembled = None
+        # スタイルの定義は1度だけ求めておく
+        style_signature()
+
+    def close(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def affected_sheets(self, changed):
+        """変更されたファイルから、キーを計算し直すシートを返す（シートの一覧も読み直す）"""
+        changed = {os.path.realpath(path) for path in changed}
+        previous = {os.path.realpath(sheet.path): sheet for sheet in self.sheets}
+        self.sheets = []
+        affected = []
+        for sheet in select_sheets(self.names, self.catalog_dir):
+            path = os.path.realpath(sheet.path)
+            if path in previous and path not in changed:
+                # 読み込み済みのJSONをそのまま使う
+                sheet = previous[path]
+            else:
+                affected.append(sheet)
+            self.sheets.append(sheet)
         
-        # 商品登録（管理者）
-        ["4", "商品名未入力", "単項目", "管理者ログイン済み", "name: 空, price: '¥10,000', slug: 'test-product'", "エラー: 商品名は必須です", ""],
-        ["5", "価格未入力", "単項目", "管理者ログイン済み", "name: 'テスト商品', price: 空, slug: 'test-product'", "エラー: 価格は必須です", ""],
-        ["6", "slug未入力", "単項目", "管理者ログイン済み", "name: 'テスト商品', price: '¥10,000', slug: 空", "エラー: slugは必須です", ""],
-        ["7", "正常な商品登録", "単項目", "管理者ログイン済み", "name: 'テスト商品', price: '¥10,000', slug: 'test-product', description: '説明', stock: 10", "商品が正常に登録される", ""],
+        if os.path.realpath(SCHEMA_PATH) in changed:
+            affected += [sheet for sheet in self.sheets
+                         if sheet.data.get("models") and sheet not in affected]
+        return affected
+
+    def build(self, changed=None):
+        """ワークブックを組み立て直し、書き出し直したシートを返す（変更がなければ書き込まない）
+
+        changed を省略した場合は全シートのキーを計算する。
+        """
+        affected = self.affected_sheets(changed or ())
+        if changed is None:
+            affected = list(self.sheets)
+        try:
+            for sheet in affected:
+                self.keys[sheet.path] = sheet_cache_key(sheet)
+        except (ValueError, KeyError, OSError):
+            # 読み込めなかったシートがあれば、次の変更では全シートを読み直す
+            self.sheets = []
+            raise
         
-        # 商品登録 - 相関チェック
-        ["8", "重複するslugで登録", "相関", "slug 'existing-slug' が既に存在", "slug: 'existing-slug', name: '新商品'", "エラー: このslugは既に使用されています", ""],
-        ["9", "在庫数が負の値", "相関", "管理者ログイン済み", "stock: -1", "エラーまたは0に補正", ""],
+        keys = [self.keys[sheet.path] for sheet in self.sheets]
+        stale = [sheet for sheet, key in zip(self.sheets, keys) if key not in self.sheet_xml_paths]
+        for sheet, path in zip(stale, render_sheets(stale, self.tmpdir, jobs=1)):
+            key = self.keys[sheet.path]
+            self.sheet_xml_paths[key] = os.path.join(self.tmpdir, f"{key}.xml")
+            os.replace(path, self.sheet_xml_paths[key])
         
-        # 商品更新
-        ["10", "存在しない商品IDで更新", "相関", "管理者ログイン済み", "id: 'invalid-id', name: '更新商品'", "404エラー", ""],
-        ["11", "正常な商品更新", "相関", "商品が存在、管理者ログイン済み", "id: 'valid-id', name: '更新された商品名'", "商品が正常に更新される", ""],
+        titles = [sheet.title for sheet in self.sheets]
+        if (titles, keys) != self.assembled or not os.path.exists(self.filename):
+            assemble_workbook(titles, [self.sheet_xml_paths[key] for key in keys],
+                              self.filename, self.tmpdir)
+            self.assembled = (titles, keys)
         
-        # 商品削除
-        ["12", "存在しない商品IDで削除", "相関", "管理者ログイン済み", "id: 'invalid-id'", "404エラー", ""],
-        ["13", "正常な商品削除", "相関", "商品が存在、管理者ログイン済み", "id: 'valid-id'", "商品が正常に削除される", ""],
-    ]
-    
-    for row_num, test_case in enumerate(test_cases, 2):
-        for col_num, value in enumerate(test_case, 1):
-            cell = ws.cell(row=row_num, column=col_num)
-            cell.value = value
-            cell.border = border
-            if col_num in [1, 3]:
-                cell.alignment = center_alignment
-            else:
-                cell.alignment = left_alignment
-    
-    ws.column_dimensions['A'].width = 5
-    ws.column_dimensions['B'].width = 25
-    ws.column_dimensions['C'].width = 12
-    ws.column_dimensions['D'].width = 20
-    ws.column_dimensions['E'].width = 40
-    ws.column_dimensions['F'].width = 40
-    ws.column_dimensions['G'].width = 20
+        # 使われなくなったシートXMLを削除する
+        for key in set(self.sheet_xml_paths) - set(keys):
+            os.remove(self.sheet_xml_paths.pop(key))
+        return stale
 
-def create_order_sheet(ws, header_fill, header_font, border, center_alignment, left_alignment):
-    """注文処理機能のテストケース"""
-    headers = ["No", "テスト項目", "テスト種別", "前提条件", "入力データ", "期待結果", "備考"]
-    ws.append(headers)
-    
-    for col_num, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col_num)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = center_alignment
-        cell.border = border
-    
-    test_cases = [
-        # 注文作成 - 単項目チェック
-        ["1", "商品ID未指定", "単項目", "なし", "items: []", "エラー: 商品を選択してください", ""],
-        ["2", "数量未指定", "単項目", "商品が存在", "items: [{id: 'product-id', quantity: 0}]", "エラー: 数量を指定してください", ""],
-        ["3", "配送先氏名未入力", "単項目", "なし", "shipping: {lastName: 空, firstName: '太郎'}", "エラー: 配送先情報を入力してください", ""],
-        ["4", "メールアドレス未入力", "単項目", "なし", "shipping: {email: 空}", "エラー: メールアドレスを入力してください", ""],
-        ["5", "郵便番号未入力", "単項目", "なし", "shipping: {postalCode: 空}", "エラー: 郵便番号を入力してください", ""],
-        ["6", "電話番号未入力", "単項目", "なし", "shipping: {phone: 空}", "エラー: 電話番号を入力してください", ""],
-        
-        # 注文作成 - 相関チェック
-        ["7", "在庫不足の商品を注文", "相関", "商品の在庫が5、注文数量が10", "items: [{id: 'product-id', quantity: 10}], product.stock: 5", "エラー: 商品「XXX」の在庫が不足しています（残り5点）", ""],
-        ["8", "存在しない商品IDで注文", "相関", "なし", "items: [{id: 'invalid-id', quantity: 1}]", "エラー: 商品「XXX」が見つかりません", ""],
-        ["9", "正常な注文（ログインユーザー）", "相関", "ユーザーログイン済み、在庫あり", "items: [{id: 'valid-id', quantity: 2}], userId: 'user-id'", "注文が作成され、在庫が減算される", ""],
-        ["10", "正常な注文（ゲスト）", "相関", "在庫あり", "items: [{id: 'valid-id', quantity: 1}], userId: null", "注文が作成される（userIdはnull）", ""],
-        ["11", "注文後在庫が減算される", "相関", "商品在庫10、注文数量3", "items: [{id: 'product-id', quantity: 3}]", "注文後、商品在庫が7になる", ""],
-        ["12", "送料計算（15,000円未満）", "相関", "合計金額が14,000円", "payment: {total: 14000}", "送料500円が加算される", ""],
-        ["13", "送料計算（15,000円以上）", "相関", "合計金額が15,000円以上", "payment: {total: 15000}", "送料0円", ""],
-        
-        # 注文取得
-        ["14", "ユーザーID指定で注文取得", "相関", "ユーザーがログイン済み", "GET /api/orders?userId=user-id", "該当ユーザーの注文一覧が取得できる", ""],
-        ["15", "全注文取得（管理者）", "相関", "管理者ログイン済み", "GET /api/orders", "全注文の一覧が取得できる", ""],
-    ]
-    
-    for row_num, test_case in enumerate(test_cases, 2):
-        for col_num, value in enumerate(test_case, 1):
-            cell = ws.cell(row=row_num, column=col_num)
-            cell.value = value
-            cell.border = border
-            if col_num in [1, 3]:
-                cell.alignment = center_alignment
-            else:
-                cell.alignment = left_alignment
-    
-    ws.column_dimensions['A'].width = 5
-    ws.column_dimensions['B'].width = 25
-    ws.column_dimensions['C'].width = 12
-    ws.column_dimensions['D'].width = 20
-    ws.column_dimensions['E'].width = 40
-    ws.column_dimensions['F'].width = 40
-    ws.column_dimensions['G'].width = 20
+def referencing_sheets(sheets, route_file):
+    """route.ts のエンドポイントを参照している行があるシートの名前"""
+    segments = route_path(route_file).strip("/").split("/")
+    
+    def matches(path):
+        parts = path.split("?", 1)[0].strip("/").split("/")
+        return len(parts) == len(segments) and all(
+            segment.startswith("[") or segment == part for segment, part in zip(segments, parts))
+    
+    titles = []
+    for sheet in sheets:
+        for test_case in sheet.cases():
+            paths = [test_case.endpoint.partition(" ")[2]] if test_case.endpoint else []
+            if test_case.http_call:
+                paths.append(test_case.http_call[1])
+            if any(matches(path) for path in paths):
+                titles.append(sheet.title)
+                break
+    return titles
 
-def create_stylist_apply_sheet(ws, header_fill, header_font, border, center_alignment, left_alignment):
-    """スタイリスト申請機能のテストケース"""
-    headers = ["No", "テスト項目", "テスト種別", "前提条件", "入力データ", "期待結果", "備考"]
-    ws.append(headers)
-    
-    for col_num, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col_num)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = center_alignment
-        cell.border = border
-    
-    test_cases = [
-        # スタイリスト申請 - 単項目チェック
-        ["1", "名前未入力", "単項目", "なし", "name: 空, bio: '自己紹介', email: 'stylist@example.com'", "エラー: 名前、自己紹介、メールアドレスは必須です", ""],
-        ["2", "自己紹介未入力", "単項目", "なし", "name: 'スタイリスト', bio: 空, email: 'stylist@example.com'", "エラー: 名前、自己紹介、メールアドレスは必須です", ""],
-        ["3", "メールアドレス未入力", "単項目", "なし", "name: 'スタイリスト', bio: '自己紹介', email: 空", "エラー: 名前、自己紹介、メールアドレスは必須です", ""],
-        ["4", "正常な申請", "単項目", "なし", "name: 'スタイリスト', bio: '自己紹介', email: 'new@example.com'", "スタイリスト登録申請を受け付けました", ""],
-        
-        # スタイリスト申請 - 相関チェック
-        ["5", "既存スタイリストのメールアドレスで申請", "相関", "メールアドレス 'existing@example.com' が既にスタイリスト登録済み", "email: 'existing@example.com'", "エラー: このメールアドレスは既に登録されています", ""],
-        ["6", "申請中のメールアドレスで再申請", "相関", "メールアドレス 'pending@example.com' で申請中（status: pending）", "email: 'pending@example.com'", "エラー: このメールアドレスで既に申請が送信されています。審査をお待ちください。", ""],
-        ["7", "パスワードありで申請", "相関", "なし", "password: 'stylist123'", "パスワードがハッシュ化されて保存される", ""],
-        ["8", "パスワードなしで申請", "相関", "なし", "password: null", "申請は受理される（パスワードは後で設定可能）", ""],
-    ]
-    
-    for row_num, test_case in enumerate(test_cases, 2):
-        for col_num, value in enumerate(test_case, 1):
-            cell = ws.cell(row=row_num, column=col_num)
-            cell.value = value
-            cell.border = border
-            if col_num in [1, 3]:
-                cell.alignment = center_alignment
+def watch_test_cases(filename=OUTPUT_FILENAME, catalog_dir=CATALOG_DIR, names=None):
+    """カタログ・app/api/**/route.ts・prisma/schema.prisma を監視し、変更のたびにワークブックを更新する"""
+    workbook = IncrementalWorkbook(filename, catalog_dir, names)
+    watcher = FileWatcher([(catalog_dir, "*.json"), (API_DIR, "**/route.ts"),
+                           (SCHEMA_PATH.parent, SCHEMA_PATH.name)])
+    try:
+        workbook.build()
+        print(f"✅ テストケースExcelファイルを作成しました: {filename}")
+        print("変更を監視しています（Ctrl+C で終了）")
+        for changed in watcher.changes():
+            start = time.perf_counter()
+            try:
+                rebuilt = workbook.build(changed)
+            except (ValueError, KeyError, OSError) as e:
+                # 保存途中のJSONなどは、次の変更で読み直す
+                print(f"❌ 更新できませんでした: {type(e).__name__}: {e}")
+                continue
+            for path in sorted(changed):
+                if path.name == "route.ts":
+                    titles = referencing_sheets(workbook.sheets, path)
+                    print(f"⚠️ {route_path(path)} が変更されました"
+                          f"（参照しているシート: {', '.join(titles) or 'なし'}）")
+            elapsed = time.perf_counter() - start
+            if rebuilt:
+                print(f"✅ 更新しました（{', '.join(sheet.title for sheet in rebuilt)}、"
+                      f"{elapsed:.2f}秒）: {filename}")
             else:
-                cell.alignment = left_alignment
-    
-    ws.column_dimensions['A'].width = 5
-    ws.column_dimensions['B'].width = 25
-    ws.column_dimensions['C'].width = 12
-    ws.column_dimensions['D'].width = 20
-    ws.column_dimensions['E'].width = 40
-    ws.column_dimensions['F'].width = 40
-    ws.column_dimensions['G'].width = 20
+                print(f"テストケースに変更はありません（{elapsed:.2f}秒）")
+    except KeyboardInterrupt:
+        print("監視を終了しました")
+    finally:
+        workbook.close()
 
-def create_inquiry_sheet(ws, header_fill, header_font, border, center_alignment, left_alignment):
-    """お問い合わせ機能のテストケース"""
-    headers = ["No", "テスト項目", "テスト種別", "前提条件", "入力データ", "期待結果", "備考"]
-    ws.append(headers)
-    
-    for col_num, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col_num)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = center_alignment
-        cell.border = border
-    
-    test_cases = [
-        # お問い合わせ作成 - 単項目チェック
-        ["1", "名前未入力", "単項目", "なし", "name: 空, email: 'test@example.com', inquiryType: 'styling', message: 'メッセージ'", "エラー: すべての必須項目を入力してください", ""],
-        ["2", "メールアドレス未入力", "単項目", "なし", "name: 'テスト', email: 空, inquiryType: 'styling', message: 'メッセージ'", "エラー: すべての必須項目を入力してください", ""],
-        ["3", "問い合わせ種別未選択", "単項目", "なし", "name: 'テスト', email: 'test@example.com', inquiryType: 空, message: 'メッセージ'", "エラー: すべての必須項目を入力してください", ""],
-        ["4", "メッセージ未入力", "単項目", "なし", "name: 'テスト', email: 'test@example.com', inquiryType: 'styling', message: 空", "エラー: すべての必須項目を入力してください", ""],
-        ["5", "メールアドレス形式不正", "単項目", "なし", "email: 'invalid-email'", "エラー: 有効なメールアドレスを入力してください", ""],
-        ["6", "正常なお問い合わせ作成", "単項目", "なし", "name: 'テスト', email: 'test@example.com', inquiryType: 'styling', message: 'メッセージ'", "お問い合わせが作成される", ""],
-        
-        # お問い合わせ作成 - 相関チェック
-        ["7", "ログインユーザーでお問い合わせ", "相関", "ユーザーがログイン済み", "userId: 'user-id', name: 'テスト', email: 'test@example.com'", "お問い合わせにuserIdが紐付けられる", ""],
-        ["8", "スタイリスト指定でお問い合わせ", "相関", "スタイリストが存在", "stylistId: 'stylist-id', inquiryType: 'styling'", "お問い合わせにstylistIdが紐付けられる", ""],
-        ["9", "ゲストでお問い合わせ", "相関", "ログインしていない", "userId: null, name: 'ゲスト', email: 'guest@example.com'", "お問い合わせが作成される（userIdはnull）", ""],
-        
-        # お問い合わせ取得
-        ["10", "ユーザーID指定で取得", "相関", "ユーザーがログイン済み", "GET /api/inquiries?userId=user-id", "該当ユーザーのお問い合わせ一覧が取得できる", ""],
-        ["11", "スタイリストID指定で取得", "相関", "スタイリストがログイン済み", "GET /api/inquiries?stylistId=stylist-id", "該当スタイリストのお問い合わせ一覧が取得できる", ""],
-    ]
-    
-    for row_num, test_case in enumerate(test_cases, 2):
-        for col_num, value in enumerate(test_case, 1):
-            cell = ws.cell(row=row_num, column=col_num)
-            cell.value = value
-            cell.border = border
-            if col_num in [1, 3]:
-                cell.alignment = center_alignment
-            else:
-                cell.alignment = left_alignment
-    
-    ws.column_dimensions['A'].width = 5
-    ws.column_dimensions['B'].width = 25
-    ws.column_dimensions['C'].width = 12
-    ws.column_dimensions['D'].width = 20
-    ws.column_dimensions['E'].width = 40
-    ws.column_dimensions['F'].width = 40
-    ws.column_dimensions['G'].width = 20
+def sheet_cache_key(sheet, start=0, stop=None):
+    """シートの見出し・行（start〜stop 行目）・スタイルから、キャッシュのキーとなるハッシュを求める"""
+    h = hashlib.sha256()
+    h.update(style_signature().encode())
+    h.update(json.dumps([sheet.title, HEADERS], ensure_ascii=False).encode())
+    for test_case in islice(sheet.test_cases(), start, stop):
+        h.update(json.dumps(test_case, ensure_ascii=False).encode())
+        h.update(b"\n")
+    return h.hexdigest()
 
-def create_cart_favorite_sheet(ws, header_fill, header_font, border, center_alignment, left_alignment):
-    """カート・お気に入り機能のテストケース"""
-    headers = ["No", "テスト項目", "テスト種別", "前提条件", "入力データ", "期待結果", "備考"]
-    ws.append(headers)
-    
-    for col_num, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col_num)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = center_alignment
-        cell.border = border
-    
-    test_cases = [
-        # カート機能
-        ["1", "商品をカートに追加", "単項目", "商品が存在", "productId: 'product-id', quantity: 1", "カートに商品が追加される", "フロントエンド実装"],
-        ["2", "カートから商品を削除", "単項目", "カートに商品が存在", "productId: 'product-id'", "カートから商品が削除される", "フロントエンド実装"],
-        ["3", "カート内商品の数量変更", "単項目", "カートに商品が存在", "productId: 'product-id', quantity: 3", "カート内の商品数量が更新される", "フロントエンド実装"],
-        ["4", "在庫数を超える数量をカートに追加", "相関", "商品在庫が5", "quantity: 10", "エラーまたは最大在庫数までに制限", "フロントエンド実装"],
-        ["5", "カートが空の状態でチェックアウト", "相関", "カートが空", "items: []", "エラー: カートが空です", ""],
-        
-        # お気に入り機能
-        ["6", "商品をお気に入りに追加", "単項目", "ユーザーがログイン済み、商品が存在", "productId: 'product-id'", "お気に入りに追加される", "フロントエンド実装"],
-        ["7", "お気に入りから商品を削除", "単項目", "お気に入りに商品が存在", "productId: 'product-id'", "お気に入りから削除される", "フロントエンド実装"],
-        ["8", "既にお気に入りに追加済みの商品を再追加", "相関", "商品が既にお気に入りに存在", "productId: 'existing-product-id'", "エラーまたは無視される", "フロントエンド実装"],
-        ["9", "ログインしていない状態でお気に入り追加", "相関", "ログインしていない", "productId: 'product-id'", "ログインを促すメッセージ", "フロントエンド実装"],
-    ]
-    
-    for row_num, test_case in enumerate(test_cases, 2):
-        for col_num, value in enumerate(test_case, 1):
-            cell = ws.cell(row=row_num, column=col_num)
-            cell.value = value
-            cell.border = border
-            if col_num in [1, 3]:
-                cell.alignment = center_alignment
-            else:
-                cell.alignment = left_alignment
-    
-    ws.column_dimensions['A'].width = 5
-    ws.column_dimensions['B'].width = 25
-    ws.column_dimensions['C'].width = 12
-    ws.column_dimensions['D'].width = 20
-    ws.column_dimensions['E'].width = 40
-    ws.column_dimensions['F'].width = 40
-    ws.column_dimensions['G'].width = 20
+@lru_cache(maxsize=None)
+def style_signature():
+    """列幅の決め方・揃え・名前付きスタイルの定義とopenpyxlのバージョンを表す文字列"""
+    wb = Workbook(write_only=True)
+    register_named_styles(wb)
+    named_styles = [(style.name, style.font, style.fill, style.border, style.alignment)
+                    for style in wb._named_styles]
+    column_sizing = (MIN_COLUMN_WIDTH, MAX_COLUMN_WIDTH, WIDTH_PADDING)
+    return repr((openpyxl.__version__, column_sizing, CENTER_COLUMNS, named_styles))
 
-def create_newsletter_sheet(ws, header_fill, header_font, border, center_alignment, left_alignment):
-    """メルマガ登録機能のテストケース"""
-    headers = ["No", "テスト項目", "テスト種別", "前提条件", "入力データ", "期待結果", "備考"]
-    ws.append(headers)
-    
-    for col_num, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col_num)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = center_alignment
-        cell.border = border
-    
-    test_cases = [
-        # メルマガ登録 - 単項目チェック
-        ["1", "メールアドレス未入力", "単項目", "なし", "email: 空", "エラー: メールアドレスを入力してください", ""],
-        ["2", "メールアドレス形式不正", "単項目", "なし", "email: 'invalid-email'", "エラー: 有効なメールアドレスを入力してください", ""],
-        ["3", "正常なメルマガ登録", "単項目", "なし", "email: 'new@example.com'", "メルマガ登録が完了する", ""],
-        
-        # メルマガ登録 - 相関チェック
-        ["4", "既に登録済みのメールアドレス", "相関", "メールアドレス 'existing@example.com' が既に登録済み", "email: 'existing@example.com'", "エラーまたは既に登録済みメッセージ", ""],
-        ["5", "ログインユーザーでメルマガ登録", "相関", "ユーザーがログイン済み", "email: 'user@example.com', userId: 'user-id'", "メルマガ登録にuserIdが紐付けられる", ""],
-        ["6", "メルマガ配信停止", "相関", "メルマガ登録済み", "email: 'subscribed@example.com', isActive: false", "メルマガ配信が停止される", ""],
-        ["7", "メルマガ配信再開", "相関", "メルマガ配信停止中", "email: 'unsubscribed@example.com', isActive: true", "メルマガ配信が再開される", ""],
-    ]
-    
-    for row_num, test_case in enumerate(test_cases, 2):
-        for col_num, value in enumerate(test_case, 1):
-            cell = ws.cell(row=row_num, column=col_num)
-            cell.value = value
-            cell.border = border
-            if col_num in [1, 3]:
-                cell.alignment = center_alignment
-            else:
-                cell.alignment = left_alignment
-    
-    ws.column_dimensions['A'].width = 5
-    ws.column_dimensions['B'].width = 25
-    ws.column_dimensions['C'].width = 12
-    ws.column_dimensions['D'].width = 20
-    ws.column_dimensions['E'].width = 40
-    ws.column_dimensions['F'].width = 40
-    ws.column_dimensions['G'].width = 20
+def render_sheets(sheets, tmpdir, jobs=None, ranges=None, profiler=NULL_PROFILER):
+    """シートXMLを tmpdir に書き出し、宣言順のパスのリストを返す（jobs=1 なら同一プロセス）
 
-def create_admin_sheet(ws, header_fill, header_font, border, center_alignment, left_alignment):
-    """管理者機能のテストケース"""
-    headers = ["No", "テスト項目", "テスト種別", "前提条件", "入力データ", "期待結果", "備考"]
-    ws.append(headers)
-    
-    for col_num, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col_num)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = center_alignment
-        cell.border = border
-    
-    test_cases = [
-        # ユーザー管理
-        ["1", "ユーザー一時停止", "単項目", "管理者ログイン済み、ユーザーが存在", "userId: 'user-id', reason: '規約違反'", "ユーザーが一時停止される（isSuspended: true）", ""],
-        ["2", "ユーザー有効化", "単項目", "ユーザーが一時停止中", "userId: 'user-id'", "ユーザーが有効化される（isSuspended: false）", ""],
-        ["3", "ユーザー削除", "単項目", "管理者ログイン済み、ユーザーが存在", "userId: 'user-id'", "ユーザーが削除される", ""],
-        ["4", "存在しないユーザーIDで操作", "相関", "管理者ログイン済み", "userId: 'invalid-id'", "404エラー", ""],
-        ["5", "管理者自身を削除", "相関", "管理者ログイン済み", "userId: 'admin-user-id'（自分自身）", "エラーまたは拒否", ""],
-        
-        # スタイリスト管理
-        ["6", "スタイリスト申請承認", "単項目", "管理者ログイン済み、申請が存在", "applicationId: 'app-id', status: 'approved'", "申請が承認され、スタイリストが作成される", ""],
-        ["7", "スタイリスト申請却下", "単項目", "管理者ログイン済み、申請が存在", "applicationId: 'app-id', status: 'rejected'", "申請が却下される（status: rejected）", ""],
-        ["8", "スタイリストアカウント無効化", "単項目", "管理者ログイン済み、スタイリストが存在", "stylistId: 'stylist-id', isActive: false", "スタイリストアカウントが無効化される", ""],
-        ["9", "スタイリストアカウント有効化", "単項目", "スタイリストが無効化中", "stylistId: 'stylist-id', isActive: true", "スタイリストアカウントが有効化される", ""],
-        
-        # 監査ログ
-        ["10", "監査ログ記録（ユーザー削除）", "相関", "管理者がユーザーを削除", "action: 'delete', targetType: 'user'", "監査ログに記録される", ""],
-        ["11", "監査ログ記録（ユーザー一時停止）", "相関", "管理者がユーザーを一時停止", "action: 'suspend', targetType: 'user'", "監査ログに記録される", ""],
-        ["12", "監査ログ取得", "単項目", "管理者ログイン済み", "GET /api/admin/audit-logs", "監査ログ一覧が取得できる", ""],
-        
-        # 注文管理
-        ["13", "注文ステータス更新", "単項目", "管理者ログイン済み、注文が存在", "orderNumber: 'ORD-xxx', status: 'shipped'", "注文ステータスが更新される", ""],
-        ["14", "存在しない注文番号で更新", "相関", "管理者ログイン済み", "orderNumber: 'ORD-invalid'", "404エラー", ""],
-    ]
-    
-    for row_num, test_case in enumerate(test_cases, 2):
-        for col_num, value in enumerate(test_case, 1):
-            cell = ws.cell(row=row_num, column=col_num)
-            cell.value = value
-            cell.border = border
-            if col_num in [1, 3]:
-                cell.alignment = center_alignment
-            else:
-                cell.alignment = left_alignment
-    
-    ws.column_dimensions['A'].width = 5
-    ws.column_dimensions['B'].width = 25
-    ws.column_dimensions['C'].width = 12
-    ws.column_dimensions['D'].width = 20
-    ws.column_dimensions['E'].width = 40
-    ws.column_dimensions['F'].width = 40
-    ws.column_dimensions['G'].width = 20
+    ranges を渡すと、シートごとに (start, stop) の範囲の行だけを書き出す。
+    profiler を渡すと、各ワーカーがシートごとに計測した記録を profiler に加える。
+    """
+    if ranges is None:
+        ranges = [(0, None)] * len(sheets)
+    tasks = [(str(sheet.path), os.path.join(tmpdir, f"{idx}.{sheet.key}.xml"), start, stop,
+              profiler.enabled)
+             for idx, (sheet, (start, stop)) in enumerate(zip(sheets, ranges), 1)]
+    if jobs == 1 or len(tasks) <= 1:
+        results = [render_sheet_xml(task) for task in tasks]
+    else:
+        # fork で引き継いだ tracemalloc はワーカーのメモリを計測しないため止める
+        with ProcessPoolExecutor(max_workers=jobs, initializer=tracemalloc.stop) as executor:
+            results = list(executor.map(render_sheet_xml, tasks))
+    for _, records in results:
+        profiler.add(records)
+    return [path for path, _ in results]
 
-def create_stylist_sheet(ws, header_fill, header_font, border, center_alignment, left_alignment):
-    """スタイリスト機能のテストケース"""
-    headers = ["No", "テスト項目", "テスト種別", "前提条件", "入力データ", "期待結果", "備考"]
-    ws.append(headers)
-    
-    for col_num, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col_num)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = center_alignment
-        cell.border = border
-    
-    test_cases = [
-        # スタイリストログイン
-        ["1", "スタイリストログイン（正常）", "単項目", "スタイリストが登録済み", "email: 'stylist@example.com', password: 'stylist123'", "ログインに成功する", ""],
-        ["2", "スタイリストログイン（間違ったパスワード）", "相関", "スタイリストが登録済み", "email: 'stylist@example.com', password: 'wrong'", "エラー: メールアドレスまたはパスワードが正しくありません", ""],
-        ["3", "無効化されたスタイリストでログイン", "相関", "スタイリストが無効化中（isActive: false）", "email: 'inactive@example.com', password: 'stylist123'", "ログイン拒否", ""],
-        
-        # スタイリストプロフィール編集
-        ["4", "プロフィール更新（正常）", "単項目", "スタイリストログイン済み", "name: '更新された名前', bio: '更新された自己紹介'", "プロフィールが更新される", ""],
-        ["5", "プロフィール更新（名前未入力）", "単項目", "スタイリストログイン済み", "name: 空", "エラー: 名前は必須です", ""],
-        
-        # お問い合わせ対応
-        ["6", "お問い合わせに返信", "単項目", "スタイリストログイン済み、お問い合わせが存在", "inquiryId: 'inquiry-id', message: '返信メッセージ'", "返信が作成される", ""],
-        ["7", "存在しないお問い合わせに返信", "相関", "スタイリストログイン済み", "inquiryId: 'invalid-id'", "404エラー", ""],
-        ["8", "他のスタイリストのお問い合わせに返信", "相関", "スタイリストAがログイン、お問い合わせはスタイリストBに紐付け", "inquiryId: 'other-stylist-inquiry'", "エラーまたは拒否", ""],
-        
-        # スタイリスト評価
-        ["9", "スタイリストに評価を投稿", "単項目", "ユーザーがログイン済み、スタイリストが存在", "stylistId: 'stylist-id', rating: 5, comment: '素晴らしい'", "評価が作成される", ""],
-        ["10", "同じスタイリストに2回評価", "相関", "ユーザーが既にスタイリストを評価済み", "stylistId: 'stylist-id', rating: 4", "エラー: 既に評価済みです", ""],
-        ["11", "評価が1-5の範囲外", "単項目", "ユーザーがログイン済み", "rating: 6", "エラー: 評価は1-5の範囲で入力してください", ""],
-    ]
-    
-    for row_num, test_case in enumerate(test_cases, 2):
-        for col_num, value in enumerate(test_case, 1):
-            cell = ws.cell(row=row_num, column=col_num)
-            cell.value = value
-            cell.border = border
-            if col_num in [1, 3]:
-                cell.alignment = center_alignment
-            else:
-                cell.alignment = left_alignment
-    
-    ws.column_dimensions['A'].width = 5
-    ws.column_dimensions['B'].width = 25
-    ws.column_dimensions['C'].width = 12
-    ws.column_dimensions['D'].width = 20
-    ws.column_dimensions['E'].width = 40
-    ws.column_dimensions['F'].width = 40
-    ws.column_dimensions['G'].width = 20
+def render_sheet_xml(task):
+    """ワーカープロセスでシート1枚分を書き出し、シートXMLのパスと計測の記録のリストを返す"""
+    sheet_path, xml_path, start, stop, profile = task
+    profiler = Profiler(trace_memory=False) if profile else NULL_PROFILER
+    sheet = CatalogSheet(sheet_path)
+    
+    wb = Workbook(write_only=True)
+    register_named_styles(wb)
+    ws = wb.create_sheet(sheet.title)
+    sizer = ColumnSizer(HEADERS)
+    test_cases = profiler.collect(islice(sheet.test_cases(), start, stop), sheet.key)
+    with profiler.phase("セル書き込み", sheet.key) as record:
+        _, record["cells"], record["style_applications"] = write_sheet_streaming(ws, sizer.track(test_cases))
+    
+    with profiler.phase("シートXML書き出し", sheet.key):
+        xlsx_path = xml_path + ".xlsx"
+        wb.save(xlsx_path)
+        # シートXMLを取り出すときに、書き出しながら測った列幅を差し込む
+        with zipfile.ZipFile(xlsx_path) as archive, \
+                archive.open("xl/worksheets/sheet1.xml") as src, open(xml_path, "wb") as dst:
+            replace_cols_xml(src, dst, sizer.column_widths())
+        os.remove(xlsx_path)
+    return xml_path, profiler.phases if profile else []
 
-def create_testimonial_sheet(ws, header_fill, header_font, border, center_alignment, left_alignment):
-    """お客様の声機能のテストケース"""
-    headers = ["No", "テスト項目", "テスト種別", "前提条件", "入力データ", "期待結果", "備考"]
-    ws.append(headers)
-    
-    for col_num, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col_num)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = center_alignment
-        cell.border = border
-    
-    test_cases = [
-        # お客様の声投稿
-        ["1", "名前未入力", "単項目", "なし", "name: 空, comment: 'コメント'", "エラー: 名前を入力してください", ""],
-        ["2", "コメント未入力", "単項目", "なし", "name: 'テスト', comment: 空", "エラー: コメントを入力してください", ""],
-        ["3", "正常な投稿", "単項目", "なし", "name: 'テスト太郎', comment: '素晴らしい商品でした'", "お客様の声が投稿される（isApproved: false）", ""],
-        
-        # お客様の声投稿 - 相関チェック
-        ["4", "ログインユーザーで投稿", "相関", "ユーザーがログイン済み", "userId: 'user-id', name: 'テスト', comment: 'コメント'", "お客様の声にuserIdが紐付けられる", ""],
-        ["5", "ゲストで投稿", "相関", "ログインしていない", "userId: null, name: 'ゲスト', comment: 'コメント'", "お客様の声が投稿される（userIdはnull）", ""],
-        
-        # 管理者機能
-        ["6", "お客様の声を承認", "単項目", "管理者ログイン済み、投稿が存在", "testimonialId: 'testimonial-id', isApproved: true", "お客様の声が承認される", ""],
-        ["7", "お客様の声を削除", "単項目", "管理者ログイン済み、投稿が存在", "testimonialId: 'testimonial-id'", "お客様の声が削除される", ""],
-        ["8", "承認済みのお客様の声を表示", "相関", "お客様の声が承認済み", "GET /api/testimonials", "承認済みのお客様の声のみ表示される", ""],
-    ]
-    
-    for row_num, test_case in enumerate(test_cases, 2):
-        for col_num, value in enumerate(test_case, 1):
-            cell = ws.cell(row=row_num, column=col_num)
-            cell.value = value
-            cell.border = border
-            if col_num in [1, 3]:
-                cell.alignment = center_alignment
-            else:
-                cell.alignment = left_alignment
-    
-    ws.column_dimensions['A'].width = 5
-    ws.column_dimensions['B'].width = 25
-    ws.column_dimensions['C'].width = 12
-    ws.column_dimensions['D'].width = 20
-    ws.column_dimensions['E'].width = 40
-    ws.column_dimensions['F'].width = 40
-    ws.column_dimensions['G'].width = 20
+def assemble_workbook(titles, sheet_xml_paths, filename, tmpdir):
+    """シート名とスタイルだけを持つ空のワークブックを土台に、シートXMLを差し込んで保存する
+
+    zipのタイムスタンプと docProps/core.xml の作成・更新日時は固定し、
+    同じ内容からは同じバイト列が得られるようにする。
+    """
+    wb = Workbook(write_only=True)
+    register_named_styles(wb)
+    for title in titles:
+        wb.create_sheet(title)
+    skeleton = os.path.join(tmpdir, os.path.basename(filename) + ".skeleton.xlsx")
+    wb.save(skeleton)
+    
+    # 保存時に更新日時が現在時刻になるため、core.xml は固定の日時で書き直す
+    wb.properties.created = wb.properties.modified = FIXED_TIMESTAMP
+    core_xml = tostring(wb.properties.to_tree())
+    
+    replacements = {f"xl/worksheets/sheet{idx}.xml": path
+                    for idx, path in enumerate(sheet_xml_paths, 1)}
+    with zipfile.ZipFile(skeleton) as src, \
+            zipfile.ZipFile(filename, "w", zipfile.ZIP_DEFLATED) as dst:
+        for item in src.infolist():
+            info = zipfile.ZipInfo(item.filename, date_time=(1980, 1, 1, 0, 0, 0))
+            info.compress_type = zipfile.ZIP_DEFLATED
+            with dst.open(info, "w", force_zip64=True) as out:
+                if item.filename in replacements:
+                    with open(replacements[item.filename], "rb") as part:
+                        shutil.copyfileobj(part, out)
+                elif item.filename == "docProps/core.xml":
+                    out.write(core_xml)
+                else:
+                    with src.open(item) as part:
+                        shutil.copyfileobj(part, out)
+
+def main():
+    parser = argparse.ArgumentParser(description="単体テストケースExcelファイルを生成します")
+    parser.add_argument("-o", "--output", default=OUTPUT_FILENAME, help="出力ファイル名")
+    parser.add_argument("--streaming", action="store_true",
+                        help="キャッシュを使わず、書き込み専用モードで1行ずつ書き出す（大量のテストケース向け）")
+    parser.add_argument("--catalog", default=CATALOG_DIR, help="テストケースカタログのディレクトリ")
+    parser.add_argument("--sheets", nargs="+", metavar="SHEET",
+                        help="出力するシート（番号・キー・シート名）。省略時は全シート")
+    parser.add_argument("-j", "--jobs", type=int, metavar="N",
+                        help="シート（キャッシュ使用時は変更のあったシート）をNプロセスで並列に生成する（0はCPU数）")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="シートのキャッシュを使わずに全シートを生成する")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="キャッシュのディレクトリ")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        metavar="MB", help="キャッシュ容量の上限（MB）")
+    parser.add_argument("--shard-rows", type=int, metavar="N",
+                        help="1ファイルあたりの行数の上限。超える場合は番号付きのファイルに分割し、-o には索引を書き出す")
+    parser.add_argument("--shard-mb", type=float, metavar="MB",
+                        help="1ファイルあたりのセルの文字列の合計（MB）の上限。超える場合は同様に分割する")
+    parser.add_argument("--export", nargs="+", metavar="FILE", default=[],
+                        help=f"Excelと同じ行をCSV・JSON Lines・Parquetにも書き出す（{', '.join(EXPORTERS)}）")
+    parser.add_argument("--export-only", action="store_true",
+                        help="--export の形式だけを書き出し、Excelファイルは作らない")
+    parser.add_argument("--watch", action="store_true",
+                        help="カタログ・route.ts・schema.prisma の変更を監視し、変更のあったシートだけを更新し続ける")
+    parser.add_argument("--profile", metavar="REPORT", help="フェーズごとの計測結果をJSONで書き出す")
+    parser.add_argument("--cprofile", metavar="FILE", help="cProfile の結果を書き出す（pstats 形式）")
+    args = parser.parse_args()
+    
+    try:
+        sheets = select_sheets(args.sheets, args.catalog)
+    except ValueError as e:
+        parser.error(str(e))
+    
+    if args.export_only and not args.export:
+        parser.error("--export-only には --export の指定が必要です")
+    sharded = bool(args.shard_rows or args.shard_mb)
+    if args.jobs is not None and args.jobs < 0:
+        parser.error(f"--jobs には0（CPU数）以上の整数を指定してください: {args.jobs}")
+    if args.streaming and args.jobs is not None:
+        parser.error("--streaming は1プロセスで書き出すため、--jobs と同時には指定できません")
+    if args.streaming and sharded:
+        parser.error("--streaming と --shard-rows / --shard-mb は同時に指定できません")
+    if args.export:
+        try:
+            exporters = export_test_cases(sheets, args.export)
+        except ValueError as e:
+            parser.error(str(e))
+        except ImportError as e:
+            print(f"❌ {e}")
+            exit(1)
+        for exporter in exporters:
+            print(f"✅ テストケースを書き出しました（{exporter.rows}行）: {exporter.path}")
+        if args.export_only:
+            return
+    
+    if args.watch:
+        watch_test_cases(args.output, args.catalog, args.sheets)
+        return
+    
+    profiler = NULL_PROFILER
+    if args.profile or args.cprofile:
+        profiler = Profiler(trace_memory=bool(args.profile), cprofile=bool(args.cprofile))
+        profiler.start()
+    
+    # --streaming は書き込み専用ワークブックに直接書き出すため、キャッシュを使わない
+    use_cache = not (args.no_cache or args.streaming)
+    cache = SheetCache(args.cache_dir, args.cache_size * 1024 * 1024) if use_cache else None
+    if sharded:
+        max_bytes = int(args.shard_mb * 1024 * 1024) if args.shard_mb else None
+        create_test_cases_excel_sharded(args.output, sheets=sheets, max_rows=args.shard_rows,
+                                        max_bytes=max_bytes, jobs=args.jobs or None, cache=cache,
+                                        profiler=profiler)
+    elif cache is not None:
+        jobs = 1 if args.jobs is None else args.jobs or None
+        create_test_cases_excel_cached(args.output, sheets=sheets, jobs=jobs, cache=cache,
+                                       profiler=profiler)
+    elif args.jobs is not None:
+        create_test_cases_excel_parallel(args.output, sheets=sheets, jobs=args.jobs or None,
+                                         profiler=profiler)
+    else:
+        create_test_cases_excel(args.output, streaming=args.streaming, sheets=sheets,
+                                profiler=profiler)
+    
+    if profiler.enabled:
+        profiler.stop()
+        profiler.print_summary()
+        if args.profile:
+            profiler.write_report(args.profile)
+            print(f"✅ 計測結果を書き出しました: {args.profile}")
+        if args.cprofile:
+            profiler.write_cprofile(args.cprofile)
+            print(f"✅ cProfile の結果を書き出しました: {args.cprofile}")
 
 if __name__ == "__main__":
-    create_test_cases_excel()
+    main()
@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+"""
+単体テストケース一覧の生成・解析ツール群
+"""
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+シート単位の生成結果キャッシュ
+
+シートの内容（見出し・行・スタイル）のハッシュをキーに、書き出し済みのシートXMLを
+ディスクに保存する。キャッシュ全体の容量が上限を超えたら古いものから削除する。
+"""
+
+import json
+import os
+import shutil
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / ".testcase_cache"
+
+# キャッシュ容量の上限（バイト）
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+class SheetCache:
+    """シートXMLのキャッシュと、出力済みワークブックの記録"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.sheets_dir = self.cache_dir / "sheets"
+        self.manifest_path = self.cache_dir / "outputs.json"
+        self.max_bytes = max_bytes
+        self.sheets_dir.mkdir(parents=True, exist_ok=True)
+
+    def _entry_path(self, key):
+        return self.sheets_dir / f"{key}.xml"
+
+    def get(self, key):
+        """キャッシュ済みのシートXMLのパスを返す（なければ None）"""
+        path = self._entry_path(key)
+        if not path.exists():
+            return None
+        # 最近使ったものを残すため、参照時に更新日時を更新する
+        os.utime(path)
+        return path
+
+    def put(self, key, src_path):
+        """シートXMLをキャッシュに登録し、キャッシュ内のパスを返す"""
+        path = self._entry_path(key)
+        tmp_path = path.with_suffix(".tmp")
+        shutil.copyfile(src_path, tmp_path)
+        os.replace(tmp_path, path)
+        return path
+
+    def evict(self):
+        """容量の上限を超えている間、更新日時の古いエントリから削除する"""
+        entries = []
+        total = 0
+        for path in self.sheets_dir.glob("*.xml"):
+            stat = path.stat()
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+            total += stat.st_size
+
+        entries.sort()
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink()
+            total -= size
+            removed += 1
+        return removed
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def is_output_current(self, filename, key):
+        """前回 key で書き出したファイルが、そのまま残っているか"""
+        record = self._load_manifest().get(str(Path(filename).resolve()))
+        if record is None or record["key"] != key:
+            return False
+        try:
+            stat = os.stat(filename)
+        except FileNotFoundError:
+            return False
+        return stat.st_size == record["size"] and stat.st_mtime_ns == record["mtime_ns"]
+
+    def record_output(self, filename, key):
+        """書き出したファイルと、その内容のキーを記録する"""
+        manifest = self._load_manifest()
+        stat = os.stat(filename)
+        manifest[str(Path(filename).resolve())] = {
+            "key": key,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.manifest_path)
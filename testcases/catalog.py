@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+テストケースカタログの読み込み
+
+テストケースは機能ごとに testcases/sheets/NN_<機能名>.json に定義する。
+ファイルの一覧はファイル名だけで決まり、JSONは要求されたシートだけ遅延して読み込む。
+"""
+
+import json
+from pathlib import Path
+
+from testcases.model import TestCase
+from testcases.pairwise import expand_combinations
+from testcases.schema import schema_test_cases
+
+CATALOG_DIR = Path(__file__).resolve().parent / "sheets"
+
+HEADERS = ["No", "テスト項目", "テスト種別", "前提条件", "入力データ", "期待結果", "備考"]
+
+class CatalogSheet:
+    """カタログ内の1シート分のテストケース定義（初回アクセス時に読み込む）"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        # "01_user_auth" -> 番号 "01", キー "user_auth"
+        self.number, _, self.key = self.path.stem.partition("_")
+        self._data = None
+
+    def __repr__(self):
+        return f"CatalogSheet({self.path.name!r})"
+
+    @property
+    def data(self):
+        if self._data is None:
+            with open(self.path, encoding="utf-8") as f:
+                self._data = json.load(f)
+        return self._data
+
+    @property
+    def title(self):
+        return self.data["title"]
+
+    @property
+    def description(self):
+        return self.data.get("description", "")
+
+    def test_cases(self):
+        """テストケース行を1行ずつ返す
+
+        combinations に組み合わせ定義がある場合や、models にPrismaのモデルが
+        指定されている場合は、手書きの行に続けて生成した行を No の連番で返す。
+        """
+        for _, test_case in self.rows():
+            yield test_case
+
+    def cases(self):
+        """テストケース行を testcases.model.TestCase として1行ずつ返す（エンドポイント付き）"""
+        for endpoint, test_case in self.rows():
+            yield TestCase.from_row(test_case, endpoint)
+
+    def rows(self):
+        """(エンドポイント, テストケース行) を1行ずつ返す
+
+        エンドポイント（"POST /api/auth/register" など）はグループまたは組み合わせ定義の
+        endpoint から取り、指定がなければ None になる。
+        """
+        last_no = 0
+        for group in self.data["groups"]:
+            endpoint = group.get("endpoint")
+            for test_case in group["test_cases"]:
+                if test_case[0].isdigit():
+                    last_no = max(last_no, int(test_case[0]))
+                yield endpoint, test_case
+        
+        for spec in self.data.get("combinations", []):
+            endpoint = spec.get("endpoint")
+            for test_case in expand_combinations(spec, last_no + 1):
+                last_no = int(test_case[0])
+                yield endpoint, test_case
+        
+        models = self.data.get("models", [])
+        if models:
+            for test_case in schema_test_cases(models, last_no + 1):
+                yield None, test_case
+
+    def matches(self, name):
+        """番号（"1" / "01"）、キー、シート名のいずれかで一致するか
+
+        番号とキーはファイル名だけで判定するため、JSONは読み込まない。
+        """
+        if name.isdigit():
+            return int(name) == int(self.number)
+        return name == self.key or name == self.title
+
+def list_sheets(catalog_dir=CATALOG_DIR):
+    """カタログ内の全シートを宣言順（ファイル名順）に返す"""
+    return [CatalogSheet(path) for path in sorted(Path(catalog_dir).glob("*.json"))]
+
+def select_sheets(names=None, catalog_dir=CATALOG_DIR):
+    """指定されたシートだけを宣言順に返す（names が空なら全シート）"""
+    sheets = list_sheets(catalog_dir)
+    if not names:
+        return sheets
+    
+    selected = [sheet for sheet in sheets if any(sheet.matches(name) for name in names)]
+    unknown = [name for name in names if not any(sheet.matches(name) for sheet in sheets)]
+    if unknown:
+        raise ValueError(f"カタログに存在しないシートです: {', '.join(unknown)}")
+    return selected
+
+def dump_sheet(data, f):
+    """シート定義をカタログと同じ形式（テストケース1行を1行）でJSONに書き出す"""
+    def dumps(value):
+        return json.dumps(value, ensure_ascii=False)
+    
+    lines = ["{"]
+    for key, value in data.items():
+        if key != "groups":
+            lines.append(f"  {dumps(key)}: {dumps(value)},")
+    lines.append('  "groups": [')
+    groups = data.get("groups", [])
+    for gi, group in enumerate(groups):
+        lines.append("    {")
+        for key, value in group.items():
+            if key != "test_cases":
+                lines.append(f"      {dumps(key)}: {dumps(value)},")
+        lines.append('      "test_cases": [')
+        test_cases = group["test_cases"]
+        for ri, test_case in enumerate(test_cases):
+            comma = "," if ri < len(test_cases) - 1 else ""
+            lines.append(f"        {dumps(test_case)}{comma}")
+        lines.append("      ]")
+        lines.append("    }" + ("," if gi < len(groups) - 1 else ""))
+    lines.append("  ]")
+    lines.append("}")
+    f.write("\n".join(lines) + "\n")
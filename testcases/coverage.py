@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+APIエンドポイントの網羅状況
+
+app/api のルートハンドラー（メソッドとパス）ごとに、それを参照しているカタログの行を
+転置索引にまとめ、テストケースのないエンドポイントを一覧にする。
+
+行からの参照は、グループ・組み合わせ定義の endpoint と、「GET /api/products/abc」のような
+入力データから求める。具体的なパスは、ルートのパスをセグメントごとにたどる木
+（[id] は任意のセグメント、[...slug] は残りすべてに一致）で1回たどるだけで解決するため、
+行数とルート数の積には比例しない。
+
+    python -m testcases.coverage -o エンドポイント網羅.xlsx --json coverage.json
+"""
+
+import argparse
+import json
+
+from openpyxl import Workbook
+
+from testcases.catalog import CATALOG_DIR, select_sheets
+from testcases.routes import API_DIR, RouteScanner
+from testcases.styles import CENTER_STYLE, HEADER_STYLE, LEFT_STYLE, register_named_styles, set_column_widths
+from testcases.widths import ColumnSizer
+
+COVERAGE_HEADERS = ["メソッド", "パス", "ファイル", "テストケース数", "シート", "No"]
+
+# 中央揃えにする列番号（メソッド, テストケース数）
+COVERAGE_CENTER_COLUMNS = (1, 4)
+
+# 木のノードで、動的セグメントと、そのノードで終わるルートを表すキー
+PARAM = "[]"
+CATCH_ALL = "[...]"
+ROUTES = "/"
+
+def path_segments(path):
+    return [segment for segment in path.split("?", 1)[0].split("/") if segment]
+
+class RouteIndex:
+    """ルートのパスをセグメントごとにたどる木"""
+
+    def __init__(self, endpoints):
+        self.root = {}
+        for endpoint in endpoints:
+            node = self.root
+            for segment in path_segments(endpoint["path"]):
+                if segment.startswith("[..."):
+                    segment = CATCH_ALL
+                elif segment.startswith("["):
+                    segment = PARAM
+                node = node.setdefault(segment, {})
+            node.setdefault(ROUTES, {})[endpoint["method"]] = endpoint
+
+    def lookup(self, method, path):
+        """具体的なパス（または [id] を含むルートのパス）に一致するエンドポイントを返す"""
+        return self._lookup(self.root, path_segments(path), method)
+
+    def _lookup(self, node, segments, method):
+        if not segments:
+            return node.get(ROUTES, {}).get(method)
+        head, rest = segments[0], segments[1:]
+        # 固定のセグメントを優先し、なければ動的セグメントとして扱う
+        candidates = [PARAM] if head.startswith("[") else [head, PARAM]
+        for key in candidates:
+            if key in node:
+                endpoint = self._lookup(node[key], rest, method)
+                if endpoint:
+                    return endpoint
+        if CATCH_ALL in node:
+            return node[CATCH_ALL].get(ROUTES, {}).get(method)
+        return None
+
+def row_references(test_case):
+    """行（testcases.model.TestCase）が参照している (メソッド, パス) を返す"""
+    references = []
+    if test_case.endpoint:
+        method, _, path = test_case.endpoint.partition(" ")
+        references.append((method, path))
+    call = test_case.http_call
+    if call and call not in references:
+        references.append(call)
+    return references
+
+def build_coverage(sheets, endpoints):
+    """エンドポイントごとの参照行の転置索引と、どのルートにも一致しない参照を返す"""
+    index = RouteIndex(endpoints)
+    coverage = {(endpoint["method"], endpoint["path"]): [] for endpoint in endpoints}
+    unknown = []
+    for sheet in sheets:
+        for test_case in sheet.cases():
+            for method, path in row_references(test_case):
+                route = index.lookup(method, path)
+                row = {"sheet": sheet.title, "no": test_case.no}
+                if route is None:
+                    unknown.append({**row, "method": method, "path": path})
+                else:
+                    coverage[(route["method"], route["path"])].append(row)
+    return coverage, unknown
+
+def write_coverage_sheet(filename, endpoints, coverage):
+    """エンドポイントごとの参照行を1シートのワークブックに書き出す"""
+    wb = Workbook()
+    register_named_styles(wb)
+    ws = wb.active
+    ws.title = "エンドポイント網羅"
+
+    ws.append(COVERAGE_HEADERS)
+    for cell in ws[1]:
+        cell.style = HEADER_STYLE
+
+    sizer = ColumnSizer(COVERAGE_HEADERS)
+    for row_num, endpoint in enumerate(endpoints, 2):
+        rows = coverage[(endpoint["method"], endpoint["path"])]
+        sheets = list(dict.fromkeys(row["sheet"] for row in rows))
+        values = [endpoint["method"], endpoint["path"], endpoint["file"], len(rows),
+                  "\n".join(sheets), ", ".join(row["no"] for row in rows)]
+        sizer.measure(values)
+        for col_num, value in enumerate(values, 1):
+            cell = ws.cell(row=row_num, column=col_num, value=value)
+            cell.style = CENTER_STYLE if col_num in COVERAGE_CENTER_COLUMNS else LEFT_STYLE
+
+    set_column_widths(ws, sizer.column_widths())
+    ws.freeze_panes = "A2"
+    wb.save(filename)
+
+def coverage_summary(endpoints, coverage, unknown):
+    uncovered = [{"method": e["method"], "path": e["path"], "file": e["file"]}
+                 for e in endpoints if not coverage[(e["method"], e["path"])]]
+    return {
+        "routes": len(endpoints),
+        "covered": len(endpoints) - len(uncovered),
+        "uncovered": uncovered,
+        "unknown_references": unknown,
+        "coverage": {f"{method} {path}": rows for (method, path), rows in coverage.items()},
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="APIエンドポイントごとのテストケースの有無を集計します")
+    parser.add_argument("-o", "--output", help="網羅状況のシートを書き出すExcelファイル")
+    parser.add_argument("--json", help="集計結果を書き出すJSONファイル")
+    parser.add_argument("--catalog", default=CATALOG_DIR, help="テストケースカタログのディレクトリ")
+    parser.add_argument("--api-dir", default=API_DIR, help="走査するディレクトリ")
+    parser.add_argument("--no-cache", action="store_true", help="route.ts の解析結果のキャッシュを使わない")
+    args = parser.parse_args()
+
+    endpoints = RouteScanner(args.api_dir, use_cache=not args.no_cache).scan()
+    coverage, unknown = build_coverage(select_sheets(catalog_dir=args.catalog), endpoints)
+    summary = coverage_summary(endpoints, coverage, unknown)
+
+    if args.output:
+        write_coverage_sheet(args.output, endpoints, coverage)
+        print(f"✅ 網羅状況のシートを作成しました: {args.output}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        print(f"✅ 集計結果を書き出しました: {args.json}")
+
+    print(f"テストケースのあるエンドポイント: {summary['covered']}/{summary['routes']}")
+    for route in summary["uncovered"]:
+        print(f"  ❌ {route['method']} {route['path']}")
+    for ref in unknown:
+        print(f"  ⚠️ {ref['sheet']} No.{ref['no']}: {ref['method']} {ref['path']} に一致するルートがありません")
+
+if __name__ == "__main__":
+    main()
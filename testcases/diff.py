@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+2つのテストケースワークブックの差分
+
+コミット済みの 単体テストケース一覧.xlsx と生成し直したものを比べ、シートごとに
+追加・削除・変更された行と、変更された列を報告する。
+
+両方のワークブックを読み取り専用モードで1行ずつ読み、行はシートと「No」で対応付ける
+（No がない行や重複する行は内容のハッシュを使う）。保持するのは1シート分の
+キーと行のハッシュ、および変更のあった行の値だけなので、ワークブック全体の大きさには依存しない。
+
+    python -m testcases.diff HEAD:単体テストケース一覧.xlsx 単体テストケース一覧.xlsx
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from openpyxl import load_workbook
+
+KEY_COLUMN = "No"
+
+def row_values(row):
+    return ["" if value is None else str(value) for value in row]
+
+def row_digest(values):
+    return hashlib.sha1("\x1f".join(values).encode("utf-8")).digest()
+
+def keyed_rows(ws):
+    """シートの見出しと、(キー, 行のハッシュ, 値) を1行ずつ返すイテレーターの組"""
+    rows = ws.iter_rows(values_only=True)
+    headers = row_values(next(rows, ()))
+    key_index = headers.index(KEY_COLUMN) if KEY_COLUMN in headers else None
+
+    def iterate():
+        seen = set()
+        for row in rows:
+            values = row_values(row)
+            if not any(values):
+                continue
+            digest = row_digest(values)
+            key = values[key_index] if key_index is not None and key_index < len(values) else ""
+            if not key or key in seen:
+                key = "#" + digest.hex()[:12]
+            seen.add(key)
+            yield key, digest, values
+
+    return headers, iterate()
+
+def diff_sheet(old_ws, new_ws):
+    """1シート分の追加・削除・変更された行を返す"""
+    old_headers, old_rows = keyed_rows(old_ws)
+    old_digests = {key: digest for key, digest, _ in old_rows}
+
+    new_headers, new_rows = keyed_rows(new_ws)
+    added, modified_new = [], {}
+    for key, digest, values in new_rows:
+        old_digest = old_digests.pop(key, None)
+        if old_digest is None:
+            added.append({"key": key, "values": values})
+        elif old_digest != digest or old_headers != new_headers:
+            modified_new[key] = values
+    removed_keys = set(old_digests)
+    del old_digests
+
+    # 削除・変更された行の値だけを、古いシートをもう一度読んで取り出す
+    removed, modified = [], []
+    if removed_keys or modified_new:
+        _, old_rows = keyed_rows(old_ws)
+        for key, _, values in old_rows:
+            if key in removed_keys:
+                removed.append({"key": key, "values": values})
+            elif key in modified_new:
+                old = dict(zip(old_headers, values))
+                new = dict(zip(new_headers, modified_new[key]))
+                changes = {column: [old.get(column, ""), new.get(column, "")]
+                           for column in dict.fromkeys(old_headers + new_headers)
+                           if old.get(column, "") != new.get(column, "")}
+                if changes:
+                    modified.append({"key": key, "changes": changes})
+    return {"headers_changed": old_headers != new_headers,
+            "added": added, "removed": removed, "modified": modified}
+
+def diff_workbooks(old_path, new_path):
+    """シートごとの差分を宣言順に返す（片方にしかないシートも含む）"""
+    old_wb = load_workbook(old_path, read_only=True)
+    new_wb = load_workbook(new_path, read_only=True)
+    try:
+        result = {}
+        for title in dict.fromkeys(new_wb.sheetnames + old_wb.sheetnames):
+            if title not in old_wb.sheetnames:
+                _, rows = keyed_rows(new_wb[title])
+                result[title] = {"status": "added", "rows": sum(1 for _ in rows)}
+            elif title not in new_wb.sheetnames:
+                _, rows = keyed_rows(old_wb[title])
+                result[title] = {"status": "removed", "rows": sum(1 for _ in rows)}
+            else:
+                sheet_diff = diff_sheet(old_wb[title], new_wb[title])
+                if sheet_diff["added"] or sheet_diff["removed"] or sheet_diff["modified"] \
+                        or sheet_diff["headers_changed"]:
+                    result[title] = {"status": "modified", **sheet_diff}
+        return result
+    finally:
+        old_wb.close()
+        new_wb.close()
+
+def resolve_workbook(path, tmpdir):
+    """"REV:パス" の形式なら git のその版を一時ファイルに取り出してパスを返す"""
+    if os.path.exists(path) or ":" not in path:
+        return path
+    data = subprocess.run(["git", "show", path], check=True, capture_output=True).stdout
+    tmp_path = os.path.join(tmpdir, f"{len(os.listdir(tmpdir))}.xlsx")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    return tmp_path
+
+def print_diff(result):
+    for title, sheet_diff in result.items():
+        if sheet_diff["status"] != "modified":
+            label = "追加" if sheet_diff["status"] == "added" else "削除"
+            print(f"{title}: シート{label}（{sheet_diff['rows']}行）")
+            continue
+        print(f"{title}: 追加 {len(sheet_diff['added'])} / 削除 {len(sheet_diff['removed'])} / "
+              f"変更 {len(sheet_diff['modified'])}")
+        if sheet_diff["headers_changed"]:
+            print("  ~ 見出し行が変更されています")
+        for row in sheet_diff["added"]:
+            print(f"  + No.{row['key']} {' | '.join(row['values'][1:3])}")
+        for row in sheet_diff["removed"]:
+            print(f"  - No.{row['key']} {' | '.join(row['values'][1:3])}")
+        for row in sheet_diff["modified"]:
+            print(f"  ~ No.{row['key']} {', '.join(row['changes'])}")
+            for column, (old, new) in row["changes"].items():
+                print(f"      {column}: {old!r} -> {new!r}")
+
+def main():
+    parser = argparse.ArgumentParser(description="2つのテストケースワークブックの差分を表示します")
+    parser.add_argument("old", help="比較元のワークブック（\"HEAD:単体テストケース一覧.xlsx\" のように git の版も指定できる）")
+    parser.add_argument("new", help="比較先のワークブック")
+    parser.add_argument("--json", help="差分を書き出すJSONファイル")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        try:
+            old_path = resolve_workbook(args.old, tmpdir)
+            new_path = resolve_workbook(args.new, tmpdir)
+        except subprocess.CalledProcessError as e:
+            parser.error(e.stderr.decode("utf-8", "replace").strip())
+        result = diff_workbooks(old_path, new_path)
+
+    print_diff(result)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+    if result:
+        sys.exit(1)
+    print("✅ 差分はありません")
+
+if __name__ == "__main__":
+    main()
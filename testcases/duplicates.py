@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+"""
+重複・類似テストケースの検出
+
+全シートの行のうち、「テスト項目」「入力データ」「期待結果」を正規化してつなげた文字列が
+完全に一致する行と、言い回しが少し違うだけの行をまとめて報告する。
+
+類似度は列ごとに求めて重み付きで合計する。テスト項目と期待結果は文字3-gramの
+Jaccard 類似度、入力データは未入力（空）にしている項目名の集合の Jaccard 類似度
+（未入力の項目がなければ項目名と値の組）で比べる。入力データのほかの項目の値は
+エンドポイントごとに違うため、「どの項目を未入力にしたテストか」だけを比べる。
+
+類似度は MinHash 署名から推定し、候補の絞り込みには LSH（Locality Sensitive Hashing）を使う。
+列ごとに、要素を1回ずつハッシュして（one permutation hashing）署名を作り、署名を帯に分けて
+MIN_BAND_HITS 個以上の帯を共有する行だけを比較する。代表が MAX_BUCKET_LEADERS 件を超えた帯は
+候補の数え上げに使わない（使わなかった数は報告する）ため、1行あたりの手間に上限があり、
+全行の総当たりにならず行数にほぼ比例した時間で終わる。
+まとまりは先頭の行（代表）との類似度だけで決め、類似する行を次々につないで
+無関係な行まで1つのまとまりになることはない。
+
+    python -m testcases.duplicates --threshold 0.8 -o duplicates.json
+"""
+
+import argparse
+import json
+import operator
+import sys
+import unicodedata
+import zlib
+
+from testcases.catalog import CATALOG_DIR, select_sheets
+from testcases.inputs import EMPTY, parse_input_data
+
+# 比較に使う列（テスト項目・入力データ・期待結果）
+COMPARED_COLUMNS = (1, 4, 5)
+INPUT_COLUMN = 4
+
+# 列ごとの類似度の重み（合計 1）
+COLUMN_WEIGHTS = (0.4, 0.4, 0.2)
+
+SHINGLE_SIZE = 3
+
+# 署名の長さと、LSH の帯の数（帯ごとに NUM_BINS // BANDS 個の値をまとめる）
+NUM_BINS = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_BINS // BANDS
+
+DEFAULT_THRESHOLD = 0.8
+
+# 類似度を計算する候補が共有しているべき帯の数。帯を1つだけ共有する代表は比べない
+MIN_BAND_HITS = 3
+
+# 1つの帯の代表がこの数を超えたら、その帯は候補の数え上げに使わない。
+# 「email: 空」のように多くの行で同じになる帯は候補を絞る役に立たないため
+# （外した帯と候補の延べ数は結果と一緒に返して報告する）
+MAX_BUCKET_LEADERS = 64
+
+_MIX = 0x9E3779B1
+_MASK = 0xFFFFFFFF
+
+def normalize_text(text):
+    """全角・半角と空白の違いをなくした文字列"""
+    return "".join(unicodedata.normalize("NFKC", text).lower().split())
+
+def normalize(test_case):
+    """完全一致の判定に使う、比較する列をつなげた文字列"""
+    return normalize_text("\x1f".join(test_case[col] for col in COMPARED_COLUMNS))
+
+def shingles(text):
+    if len(text) <= SHINGLE_SIZE:
+        return {text}
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+def input_leaves(value, key=""):
+    """入力データの値を (項目名, 値) の組に展開する（入れ子のオブジェクト・配列は末端の項目名を使う）"""
+    if isinstance(value, dict):
+        for child_key, child in value.items():
+            yield from input_leaves(child, child_key)
+    elif isinstance(value, list):
+        for child in value:
+            yield from input_leaves(child, key)
+    else:
+        yield key, value
+
+def input_features(text):
+    """入力データの比較に使う要素の集合
+
+    未入力の項目があればその項目名、なければ項目名と値の組。解析できない入力データ
+    （「GET /api/products」など）は文字3-gramを使う。
+    """
+    inputs = parse_input_data(text)
+    if inputs is None:
+        return shingles(normalize_text(text))
+    leaves = list(input_leaves(inputs))
+    empty = {f"{key}=空" for key, value in leaves if value is EMPTY}
+    if empty:
+        return empty
+    return {f"{key}={normalize_text(str(value))}" for key, value in leaves} or {""}
+
+def column_features(test_case):
+    """比較する列ごとの要素の集合"""
+    return [input_features(test_case[col]) if col == INPUT_COLUMN else shingles(normalize_text(test_case[col]))
+            for col in COMPARED_COLUMNS]
+
+def minhash_signature(features):
+    """要素の集合の MinHash 署名（1回のハッシュで NUM_BINS 個の最小値を求める）"""
+    bins = [None] * NUM_BINS
+    for feature in features:
+        h = (zlib.crc32(feature.encode("utf-8")) * _MIX) & _MASK
+        idx, value = h % NUM_BINS, h // NUM_BINS
+        if bins[idx] is None or value < bins[idx]:
+            bins[idx] = value
+
+    # 空のビンは右隣（循環）の値で埋める（densification）。
+    # 後ろから2周たどり、直近の空でないビンを覚えておくことで1回の走査で済ませる
+    if None in bins:
+        filled = list(bins)
+        next_idx = None
+        for idx in range(2 * NUM_BINS - 1, -1, -1):
+            if filled[idx % NUM_BINS] is not None:
+                next_idx = idx
+            elif idx < NUM_BINS:
+                # 埋めた距離を混ぜ、本来の値と偶然一致しないようにする
+                bins[idx] = filled[next_idx % NUM_BINS] + (next_idx - idx) * (_MASK + 1)
+    return tuple(bins)
+
+def similarity(a, b):
+    """署名から推定した Jaccard 類似度"""
+    return sum(map(operator.eq, a, b)) / NUM_BINS
+
+def row_similarity(a, b, threshold=0.0):
+    """列ごとの署名から求めた、重み付きの類似度
+
+    残りの列がすべて一致しても threshold に届かないと分かった時点で 0 を返す。
+    """
+    score = 0.0
+    remaining = 1.0
+    for weight, x, y in zip(COLUMN_WEIGHTS, a, b):
+        remaining -= weight
+        score += weight * similarity(x, y)
+        if score + remaining < threshold:
+            return 0.0
+    return score
+
+def find_duplicates(sheets, threshold=DEFAULT_THRESHOLD):
+    """重複・類似する行のまとまりを、行数の多い順に返す
+
+    (まとまりの一覧, 候補の数え上げから外した数) を返す。各まとまりは
+    {"kind": "exact" | "near", "sheets": シート数, "rows": [...]}、外した数は
+    {"buckets": 代表が多すぎて使わなかった帯の延べ数, "candidates": その帯の代表の延べ数}。
+    """
+    # 完全一致する行は先にまとめ、代表の1行だけを類似検出にかける
+    groups = {}
+    signatures = []
+    for sheet in sheets:
+        for test_case in sheet.test_cases():
+            row = {"sheet": sheet.title, "no": test_case[0], "item": test_case[1]}
+            text = normalize(test_case)
+            if text not in groups:
+                groups[text] = []
+                signatures.append([minhash_signature(features) for features in column_features(test_case)])
+            groups[text].append(row)
+    texts = list(groups)
+
+    # 行を順に、まとまりの代表と比べ、最も類似する代表のまとまりに入れる。どれとも類似
+    # しなければ新しいまとまりの代表になる。帯には代表だけを登録し、行と共有する帯の数を
+    # 代表ごとに数えて MIN_BAND_HITS 以上の代表とだけ類似度を計算する。代表の多すぎる帯は
+    # 数えないため、1行あたりの手間は帯の数 × MAX_BUCKET_LEADERS までに収まる。
+    buckets = {}
+    members = {}
+    skipped = {"buckets": 0, "candidates": 0}
+    for idx, (text, signature) in enumerate(zip(texts, signatures)):
+        keys = [(col, band, column[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND])
+                for col, column in enumerate(signature) for band in range(BANDS)]
+        hits = {}
+        for key in keys:
+            leaders = buckets.get(key, ())
+            if len(leaders) > MAX_BUCKET_LEADERS:
+                skipped["buckets"] += 1
+                skipped["candidates"] += len(leaders)
+                continue
+            for leader in leaders:
+                hits[leader] = hits.get(leader, 0) + 1
+        best, best_score = None, 0.0
+        for leader in sorted(hits):
+            if hits[leader] < MIN_BAND_HITS:
+                continue
+            score = row_similarity(signatures[leader], signature, threshold)
+            if score >= threshold and score > best_score:
+                best, best_score = leader, score
+        if best is not None:
+            members[best].append(text)
+            continue
+        members[idx] = [text]
+        for key in keys:
+            buckets.setdefault(key, []).append(idx)
+
+    clusters = []
+    for texts_in_cluster in members.values():
+        rows = [row for text in texts_in_cluster for row in groups[text]]
+        if len(rows) < 2:
+            continue
+        clusters.append({
+            "kind": "exact" if len(texts_in_cluster) == 1 else "near",
+            "sheets": len({row["sheet"] for row in rows}),
+            "rows": rows,
+        })
+    clusters.sort(key=lambda c: (-len(c["rows"]), c["rows"][0]["sheet"], c["rows"][0]["no"]))
+    return clusters, skipped
+
+def main():
+    parser = argparse.ArgumentParser(description="シートをまたいだ重複・類似テストケースを検出します")
+    parser.add_argument("--catalog", default=CATALOG_DIR, help="テストケースカタログのディレクトリ")
+    parser.add_argument("--sheets", nargs="+", metavar="SHEET",
+                        help="対象のシート（番号・キー・シート名）。省略時は全シート")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="類似とみなす類似度（列ごとの Jaccard 類似度の重み付き合計、0〜1）")
+    parser.add_argument("--cross-sheet", action="store_true", help="複数のシートにまたがるものだけを報告する")
+    parser.add_argument("-o", "--output", help="結果を書き出すJSONファイル")
+    args = parser.parse_args()
+
+    try:
+        sheets = select_sheets(args.sheets, args.catalog)
+    except ValueError as e:
+        parser.error(str(e))
+
+    clusters, skipped = find_duplicates(sheets, args.threshold)
+    if args.cross_sheet:
+        clusters = [cluster for cluster in clusters if cluster["sheets"] > 1]
+
+    labels = {"exact": "完全一致", "near": "類似"}
+    for cluster in clusters:
+        print(f"{labels[cluster['kind']]}（{len(cluster['rows'])}行, {cluster['sheets']}シート）")
+        for row in cluster["rows"]:
+            print(f"  {row['sheet']} No.{row['no']} {row['item']}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(clusters, f, ensure_ascii=False, indent=2)
+    if skipped["buckets"]:
+        print(f"⚠️ 代表が {MAX_BUCKET_LEADERS} 件を超えた帯（延べ {skipped['buckets']:,} 件、"
+              f"候補 延べ {skipped['candidates']:,} 件）は候補の数え上げに使いませんでした", file=sys.stderr)
+    print(f"✅ 重複・類似のまとまり: {len(clusters)}件", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+テストケースのCSV / JSON Lines / Parquet への書き出し
+
+Excelと同じカタログの行を、先頭に「シート」列を加えて1行ずつ書き出す。
+複数の形式を指定した場合もカタログの走査は1回だけで、各行をすべての形式に渡す。
+出力形式はファイルの拡張子で決まる。
+
+    python generate_test_cases.py --export 単体テストケース一覧.csv 単体テストケース一覧.jsonl
+"""
+
+import csv
+import json
+from pathlib import Path
+
+from testcases.catalog import HEADERS
+
+COLUMNS = ["シート", *HEADERS]
+
+# Parquet の1行グループあたりの行数（この行数だけメモリに溜めてから書き出す）
+PARQUET_ROW_GROUP_SIZE = 10000
+
+class Exporter:
+    """1行ずつ受け取ってファイルに書き出す出力形式の基底クラス"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.rows = 0
+
+    @classmethod
+    def check_available(cls):
+        """必要なライブラリがなければ ImportError を送出する"""
+
+    def write_row(self, sheet_title, test_case):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+class CSVExporter(Exporter):
+    """CSV（Excelでそのまま開けるよう BOM 付き UTF-8）"""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self._file = open(self.path, "w", encoding="utf-8-sig", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(COLUMNS)
+
+    def write_row(self, sheet_title, test_case):
+        self._writer.writerow([sheet_title, *test_case])
+        self.rows += 1
+
+    def close(self):
+        self._file.close()
+
+class JSONLExporter(Exporter):
+    """JSON Lines（1行に1テストケースのオブジェクト）"""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self._file = open(self.path, "w", encoding="utf-8")
+
+    def write_row(self, sheet_title, test_case):
+        record = dict(zip(COLUMNS, [sheet_title, *test_case]))
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.rows += 1
+
+    def close(self):
+        self._file.close()
+
+class ParquetExporter(Exporter):
+    """Parquet（全列を文字列の列として、一定行数ごとに行グループを書き出す）"""
+
+    @classmethod
+    def check_available(cls):
+        """pyarrow（pyarrow.parquet を読み込み済み）を返す（なければ ImportError を送出する）"""
+        try:
+            import pyarrow.parquet
+        except ImportError as e:
+            raise ImportError("Parquet の書き出しには pyarrow が必要です。"
+                              "pip install pyarrow でインストールしてください") from e
+        return pyarrow
+
+    def __init__(self, path, row_group_size=PARQUET_ROW_GROUP_SIZE):
+        super().__init__(path)
+        pyarrow = self.check_available()
+        self._pa = pyarrow
+        self._schema = pyarrow.schema([(name, pyarrow.string()) for name in COLUMNS])
+        self._writer = pyarrow.parquet.ParquetWriter(self.path, self._schema)
+        self._row_group_size = row_group_size
+        self._columns = [[] for _ in COLUMNS]
+
+    def write_row(self, sheet_title, test_case):
+        for column, value in zip(self._columns, [sheet_title, *test_case]):
+            column.append(value)
+        self.rows += 1
+        if len(self._columns[0]) >= self._row_group_size:
+            self._flush()
+
+    def _flush(self):
+        if self._columns[0]:
+            self._writer.write_table(self._pa.table(self._columns, schema=self._schema))
+            self._columns = [[] for _ in COLUMNS]
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+# 拡張子と出力形式の対応
+EXPORTERS = {
+    ".csv": CSVExporter,
+    ".jsonl": JSONLExporter,
+    ".parquet": ParquetExporter,
+}
+
+def exporter_class(path):
+    """拡張子に対応する出力形式のクラスを返す"""
+    suffix = Path(path).suffix.lower()
+    if suffix not in EXPORTERS:
+        raise ValueError(f"対応していない出力形式です: {path}（{', '.join(EXPORTERS)}）")
+    return EXPORTERS[suffix]
+
+def export_test_cases(sheets, paths):
+    """カタログを1回だけ走査し、各行を指定されたすべてのファイルに書き出す
+
+    対応していない拡張子は ValueError、必要なライブラリがない形式は ImportError を送出する。
+    """
+    # 開く前に全パスの形式とライブラリを確かめ、途中で失敗して一部だけ書き出されないようにする
+    classes = [exporter_class(path) for path in paths]
+    for cls in classes:
+        cls.check_available()
+
+    exporters = []
+    try:
+        for cls, path in zip(classes, paths):
+            exporters.append(cls(path))
+        for sheet in sheets:
+            title = sheet.title
+            for test_case in sheet.test_cases():
+                for exporter in exporters:
+                    exporter.write_row(title, test_case)
+    finally:
+        for exporter in exporters:
+            exporter.close()
+    return exporters
@@ -0,0 +1,435 @@
+# -*- coding: utf-8 -*-
+"""
+前提条件のフィクスチャの一括生成
+
+カタログの「前提条件」（"ユーザーが登録済み"、"メールアドレス 'existing@example.com' が既に登録済み"、
+"ユーザーが一時停止状態（isSuspended: true）" など）を「、」で区切り、それぞれを
+prisma/schema.prisma のモデルのレコードに対応付けて、PostgreSQL の COPY 形式で書き出す。
+
+  - 同じレコード（同じID、または一意な項目が同じ値のもの）は複数の行から参照されても1件にまとめる
+  - 指定のない必須項目はスキーマの既定値か、レコードのIDから決まる値で埋めるため、
+    同じカタログからは常に同じ内容になる
+  - --users / --products / --orders を指定すると、行番号から決まる合成データを
+    メモリに保持せずに続けて書き出す（数百万件でも一定のメモリで書き出せる）
+  - パスワードは平文で COPY し、最後にパスワードの種類ごとに1回だけ pgcrypto で bcrypt にする
+
+出力は `COPY ... FROM stdin` を並べたSQLで、テーブルは外部キーの参照先から順に書き出す。
+docker/postgres/init.sql はマイグレーションより前（コンテナの初期化時）に実行されるため、
+テーブルを作ったあとで psql から読み込む。
+
+    python -m testcases.fixtures -o fixtures.sql --users 1000000 --products 10000 --orders 2000000
+    npx prisma migrate deploy
+    docker compose exec -T postgres psql -U intercambio -d intercambio_db -v ON_ERROR_STOP=1 < fixtures.sql
+"""
+
+import argparse
+import json
+import re
+import sys
+from itertools import chain
+
+from testcases.catalog import CATALOG_DIR, select_sheets
+from testcases.schema import SCHEMA_PATH, load_schema, sample_value
+
+# 日時の項目に入れる固定の値（実行のたびに内容が変わらないようにする）
+FIXTURE_TIME = "2026-01-01 00:00:00"
+
+# COPY のテキスト形式でエスケープする文字
+COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+# 項目の値のうち、レコードのIDに置き換える部分
+ID_PLACEHOLDER = "{id}"
+
+# 合成データの注文1件あたりの明細数の上限
+MAX_ITEMS_PER_ORDER = 3
+
+# 前提条件の区切り（「X が存在し、Y から参照されている」は区切らない）
+CLAUSE_SEPARATOR_RE = re.compile(r"、(?!\w+ から参照されている)")
+
+# レコードを作らない前提条件（リクエストの内容やブラウザ側の状態）
+NO_FIXTURE_RE = re.compile(r"^なし$|ログインしていない|カートが空|注文数量|合計金額")
+
+USERS = {
+    "test": {"email": "test@example.com", "password": "test123", "name": "テスト太郎"},
+    "admin": {"email": "admin@example.com", "password": "admin123", "name": "管理者", "role": "admin"},
+    "suspended": {"email": "suspended@example.com", "password": "test123", "name": "停止中ユーザー",
+                  "isSuspended": True, "suspendedAt": FIXTURE_TIME, "suspendedReason": "テスト用"},
+}
+STYLISTS = {
+    "test": {"email": "stylist@example.com", "password": "stylist123", "name": "テストスタイリスト"},
+    "inactive": {"email": "inactive-stylist@example.com", "password": "stylist123",
+                 "name": "無効スタイリスト", "isActive": False},
+}
+
+class FixtureSet:
+    """モデルごとのフィクスチャのレコード
+
+    レコードは明示した値だけを持ち、残りの項目は書き出すときにスキーマから埋める。
+    """
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.records = {model.name: {} for model in schema}
+        self.unique_values = {}
+
+    def add(self, model_name, key, **values):
+        """レコードを追加してIDを返す（同じID・同じ一意な値のレコードがあればそれにまとめる）"""
+        model = self.schema[model_name]
+        record_id = values.pop("id", None) or f"fx-{model_name.lower()}-{key}"
+        records = self.records[model_name]
+        if record_id not in records:
+            for name, value in values.items():
+                field = model.fields[name]
+                if field.unique and (model_name, name, value) in self.unique_values:
+                    record_id = self.unique_values[(model_name, name, value)]
+                    break
+
+        record = records.setdefault(record_id, {})
+        record.update(values)
+        for name, value in values.items():
+            if model.fields[name].unique:
+                self.unique_values[(model_name, name, value)] = record_id
+
+        # 必須の外部キーが未指定なら、参照先の既定のレコードを使う
+        for relation in model.relations():
+            for fk_name in relation.relation["fields"]:
+                if fk_name not in record and not model.fields[fk_name].optional:
+                    record[fk_name] = self.default(relation.type)
+        return record_id
+
+    def default(self, model_name):
+        """参照先として使う既定のレコードのID"""
+        if model_name == "User":
+            return self.user("test")
+        if model_name == "Stylist":
+            return self.stylist("test")
+        if model_name == "Product":
+            return self.product()
+        return self.add(model_name, "test")
+
+    def user(self, key, **values):
+        return self.add("User", key, **{**USERS.get(key, {}), **values})
+
+    def stylist(self, key, **values):
+        values = {**STYLISTS.get(key, {}), **values}
+        values.setdefault("email", f"stylist-{key}@example.com")
+        values.setdefault("password", "stylist123")
+        return self.add("Stylist", key, **values)
+
+    def product(self, stock=None):
+        if stock is None:
+            return self.add("Product", "test", slug="test-product", stock=100)
+        return self.add("Product", f"stock-{stock}", slug=f"test-product-stock-{stock}", stock=stock)
+
+def sample(field, prefix):
+    """スキーマの相関テストケースの入力データと同じサンプル値"""
+    value = sample_value(field, prefix).strip("'")
+    if field.type in ("Int", "BigInt"):
+        return int(value)
+    if field.type == "Boolean":
+        return value == "true"
+    return value
+
+def existing_record(fixtures, match):
+    """「<モデル> に同じ <項目> のレコードが既に存在」"""
+    model = fixtures.schema[match.group(1)]
+    targets = {fk_name: relation.type for relation in model.relations()
+               for fk_name in relation.relation["fields"]}
+    values = {}
+    for name in match.group(2).split("・"):
+        if name in targets:
+            # 外部キーは参照先の「既存」のレコードを指す
+            values[name] = fixtures.add(targets[name], "existing")
+        else:
+            values[name] = sample(model.fields[name], "existing")
+    fixtures.add(model.name, "existing", **values)
+
+def referenced_record(fixtures, match):
+    """「<参照先> が存在し、<モデル> から参照されている」"""
+    target, model = match.group(1), fixtures.schema[match.group(2)]
+    for relation in model.relations():
+        if relation.type != target:
+            continue
+        for fk_name, ref_name in zip(relation.relation["fields"], relation.relation["references"]):
+            values = {ref_name: f"referenced-{ref_name}"}
+            if target == "User":
+                values.update(email="referenced@example.com", password="test123")
+            target_id = fixtures.add(target, "referenced", **values)
+            fixtures.add(model.name, f"referencing-{target.lower()}", **{fk_name: target_id})
+
+def stylist_inquiry(fixtures, match):
+    """「お問い合わせはスタイリストBに紐付け」"""
+    stylist_id = fixtures.stylist(match.group(1).lower())
+    fixtures.add("Inquiry", f"stylist-{match.group(1).lower()}", stylistId=stylist_id,
+                 userId=fixtures.user("test"), inquiryType="styling")
+
+def stylist_rating(fixtures, match):
+    fixtures.add("StylistRating", "test", userId=fixtures.user("test"),
+                 stylistId=fixtures.stylist("test"), rating=5)
+
+def newsletter(fixtures, match):
+    if "停止" in match.group(0):
+        fixtures.add("NewsletterSubscription", "unsubscribed", email="unsubscribed@example.com",
+                     isActive=False)
+    else:
+        fixtures.add("NewsletterSubscription", "test", email="test@example.com",
+                     userId=fixtures.user("test"), isActive=True)
+
+def testimonial(fixtures, match):
+    approved = "承認済み" in match.group(0)
+    fixtures.add("Testimonial", "approved" if approved else "test", userId=fixtures.user("test"),
+                 isApproved=approved)
+
+def product(fixtures, match):
+    stock = re.search(r"在庫が?(\d+)", match.group(0))
+    fixtures.product(int(stock.group(1)) if stock else None)
+
+# (前提条件の1区切りに対する正規表現, レコードを追加する関数)。上から順に最初に一致したものを使う
+RULES = [
+    (r"^(\w+) に同じ (.+) のレコードが既に存在$", existing_record),
+    (r"^(\w+) が存在し、(\w+) から参照されている$", referenced_record),
+    (r"メールアドレス '([^']+)' で申請中（status: (\w+)）",
+     lambda f, m: f.add("StylistApplication", m.group(1).split("@")[0],
+                        email=m.group(1), status=m.group(2))),
+    (r"メールアドレス '([^']+)' が既にスタイリスト登録済み",
+     lambda f, m: f.stylist(m.group(1).split("@")[0], email=m.group(1))),
+    (r"メールアドレス '([^']+)' が既に登録済み",
+     lambda f, m: f.user(m.group(1).split("@")[0], email=m.group(1))),
+    (r"slug '([^']+)' が既に存在", lambda f, m: f.add("Product", m.group(1), slug=m.group(1))),
+    (r"^管理者が.*ユーザー", lambda f, m: (f.user("admin"), f.user("test"))),
+    (r"一時停止", lambda f, m: f.user("suspended")),
+    (r"^管理者", lambda f, m: f.user("admin")),
+    (r"スタイリスト([A-Z])がログイン", lambda f, m: f.stylist(m.group(1).lower())),
+    (r"お問い合わせはスタイリスト([A-Z])に紐付け", stylist_inquiry),
+    (r"スタイリストが無効化中", lambda f, m: f.stylist("inactive")),
+    (r"評価済み", stylist_rating),
+    (r"^スタイリスト", lambda f, m: f.stylist("test")),
+    (r"お問い合わせが存在",
+     lambda f, m: f.add("Inquiry", "test", userId=f.user("test"), stylistId=f.stylist("test"))),
+    (r"申請が存在", lambda f, m: f.add("StylistApplication", "test", email="applicant@example.com")),
+    (r"注文が存在", lambda f, m: f.add("Order", "test", userId=f.user("test"), email="test@example.com")),
+    (r"投稿が存在|お客様の声", testimonial),
+    (r"メルマガ(登録済み|配信停止中)", newsletter),
+    (r"商品|在庫", product),
+    (r"ユーザー", lambda f, m: f.user("test")),
+]
+RULES = [(re.compile(pattern), build) for pattern, build in RULES]
+
+def build_fixtures(sheets, schema):
+    """全行の前提条件からフィクスチャを作り、(フィクスチャ, 対応付けられなかった前提条件 -> 行) を返す"""
+    fixtures = FixtureSet(schema)
+    unmapped = {}
+    for sheet in sheets:
+        for test_case in sheet.cases():
+            for clause in CLAUSE_SEPARATOR_RE.split(test_case.precondition):
+                clause = clause.strip()
+                if not clause or NO_FIXTURE_RE.search(clause):
+                    continue
+                for pattern, build in RULES:
+                    match = pattern.search(clause)
+                    if match:
+                        build(fixtures, match)
+                        break
+                else:
+                    unmapped.setdefault(clause, []).append(f"{sheet.title} No.{test_case.no}")
+    return fixtures, unmapped
+
+def columns(model):
+    """COPY する項目（リストとリレーション以外の全項目）"""
+    return [field for field in model.fields.values() if field.is_scalar and not field.is_list]
+
+def default_value(field):
+    """@default(...) の値（関数の場合は now() だけを固定の日時にする）"""
+    default = field.default
+    if default is None:
+        return None
+    if default == "now()":
+        return FIXTURE_TIME
+    if default.startswith('"'):
+        return json.loads(default)
+    if default in ("true", "false"):
+        return default == "true"
+    if re.fullmatch(r"-?\d+(\.\d+)?", default):
+        return default
+    return None
+
+def fill_value(field, record_id):
+    """明示されていない項目の値（任意項目は NULL、必須項目はレコードのIDから決める）
+
+    IDから決めるため、明示した一意な値（'existing@example.com' など）とは重ならない。
+    """
+    if field.updated_at:
+        return FIXTURE_TIME
+    value = default_value(field)
+    if value is not None or field.optional:
+        return value
+    if field.type in ("Int", "BigInt", "Float", "Decimal"):
+        return 1
+    if field.type == "Boolean":
+        return False
+    if field.type == "DateTime":
+        return FIXTURE_TIME
+    if field.type == "Json":
+        return "{}"
+    if "email" in field.name.lower():
+        return f"{record_id}@example.com"
+    return f"{record_id}-{field.name}"
+
+def copy_text(value):
+    """COPY のテキスト形式の1項目"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value, ensure_ascii=False)
+    return str(value).translate(COPY_ESCAPES)
+
+def column_fillers(model_columns):
+    """明示されていない項目の COPY の値（IDから決まる値は ID_PLACEHOLDER を含む）を項目の順に返す
+
+    行ごとにスキーマを調べ直さないよう、テーブルごとに1回だけ求める。
+    """
+    fillers = []
+    for field in model_columns:
+        value = ID_PLACEHOLDER if field.is_id else copy_text(fill_value(field, ID_PLACEHOLDER))
+        fillers.append((field.name, value, ID_PLACEHOLDER in value))
+    return fillers
+
+def copy_row(fillers, record_id, values):
+    cells = []
+    for name, value, has_id in fillers:
+        if name in values:
+            cells.append(copy_text(values[name]))
+        elif has_id:
+            cells.append(value.replace(ID_PLACEHOLDER, record_id))
+        else:
+            cells.append(value)
+    return "\t".join(cells) + "\n"
+
+def table_order(schema):
+    """外部キーの参照先が先になるモデルの順"""
+    order, visiting = [], set()
+
+    def visit(model):
+        if model.name in order or model.name in visiting:
+            return
+        visiting.add(model.name)
+        for relation in model.relations():
+            if relation.type != model.name:
+                visit(schema[relation.type])
+        order.append(model.name)
+
+    for model in schema:
+        visit(model)
+    return order
+
+def mix(value, salt):
+    """行番号から決まる疑似乱数（32ビット）"""
+    value = (value * 0x9E3779B1 + salt * 0x85EBCA77) & 0xFFFFFFFF
+    value ^= value >> 15
+    return (value * 0x2C1B3C6D) & 0xFFFFFFFF
+
+def product_price(idx):
+    return (mix(idx, 1) % 490 + 10) * 100
+
+def order_items(idx, products):
+    """合成データの注文 idx の明細（商品の番号, 数量）"""
+    return [(mix(idx * MAX_ITEMS_PER_ORDER + n, 3) % products, mix(idx, 4 + n) % 3 + 1)
+            for n in range(mix(idx, 2) % MAX_ITEMS_PER_ORDER + 1)]
+
+def synthetic_rows(model_name, counts):
+    """合成データのレコードを (ID, 値) で1件ずつ返す"""
+    users, products, orders = counts.get("User", 0), counts.get("Product", 0), counts.get("Order", 0)
+    if model_name == "User":
+        for idx in range(users):
+            yield f"syn-user{idx:07d}", {
+                "email": f"user{idx:07d}@example.com", "password": "test123", "name": f"ユーザー{idx}",
+            }
+    elif model_name == "Product":
+        for idx in range(products):
+            yield f"syn-product{idx:07d}", {
+                "slug": f"product-{idx:07d}", "name": f"商品{idx}",
+                "price": f"{product_price(idx):,}", "stock": mix(idx, 5) % 100,
+            }
+    elif model_name == "Order" and products:
+        for idx in range(orders):
+            total = sum(product_price(p) * quantity for p, quantity in order_items(idx, products))
+            yield f"syn-order{idx:08d}", {
+                "orderNumber": f"ORD-{idx:08d}", "total": total, "paymentMethod": "credit_card",
+                "userId": f"syn-user{mix(idx, 6) % users:07d}" if users else None,
+                "email": f"order{idx:08d}@example.com",
+            }
+    elif model_name == "OrderItem" and products:
+        for idx in range(orders):
+            for n, (p, quantity) in enumerate(order_items(idx, products)):
+                yield f"syn-item-order{idx:08d}-{n}", {
+                    "orderId": f"syn-order{idx:08d}", "productId": f"syn-product{p:07d}",
+                    "quantity": quantity, "price": f"{product_price(p):,}", "name": f"商品{p}",
+                }
+
+def write_copy_sql(f, fixtures, counts=None):
+    """フィクスチャと合成データを COPY 形式のSQLで書き出し、テーブルごとの件数を返す"""
+    schema = fixtures.schema
+    counts = counts or {}
+    written = {}
+    f.write("-- python -m testcases.fixtures で生成\n")
+    f.write("BEGIN;\n")
+    f.write("CREATE EXTENSION IF NOT EXISTS pgcrypto;\n\n")
+    for model_name in table_order(schema):
+        model_columns = columns(schema[model_name])
+        fillers = column_fillers(model_columns)
+        records = chain(fixtures.records[model_name].items(), synthetic_rows(model_name, counts))
+        rows = 0
+        for record_id, values in records:
+            if rows == 0:
+                names = ", ".join(f'"{field.name}"' for field in model_columns)
+                f.write(f'COPY "{model_name}" ({names}) FROM stdin;\n')
+            f.write(copy_row(fillers, record_id, values))
+            rows += 1
+        if rows:
+            f.write("\\.\n\n")
+            written[model_name] = rows
+
+    # 同じパスワードは1回だけハッシュ化する
+    for model_name in written:
+        if "password" in schema[model_name].fields:
+            f.write(f'UPDATE "{model_name}" AS t SET "password" = h.hash\n'
+                    f"FROM (SELECT plain, crypt(plain, gen_salt('bf', 10)) AS hash\n"
+                    f'      FROM (SELECT DISTINCT "password" AS plain FROM "{model_name}"\n'
+                    f"            WHERE \"password\" NOT LIKE '$2%') AS d) AS h\n"
+                    f'WHERE t."password" = h.plain;\n\n')
+    f.write("COMMIT;\n")
+    return written
+
+def main():
+    parser = argparse.ArgumentParser(description="前提条件のフィクスチャを PostgreSQL の COPY 形式で書き出します")
+    parser.add_argument("-o", "--output", default="fixtures.sql", help="出力するSQLファイル（- で標準出力）")
+    parser.add_argument("--catalog", default=CATALOG_DIR, help="テストケースカタログのディレクトリ")
+    parser.add_argument("--schema", default=SCHEMA_PATH, help="Prismaのスキーマファイル")
+    parser.add_argument("--users", type=int, default=0, metavar="N", help="合成データのユーザー数")
+    parser.add_argument("--products", type=int, default=0, metavar="N", help="合成データの商品数")
+    parser.add_argument("--orders", type=int, default=0, metavar="N",
+                        help="合成データの注文数（明細は1注文あたり1〜3件。--products が必要）")
+    args = parser.parse_args()
+
+    if args.orders and not args.products:
+        parser.error("--orders には --products の指定が必要です")
+
+    schema = load_schema(args.schema)
+    fixtures, unmapped = build_fixtures(select_sheets(catalog_dir=args.catalog), schema)
+    counts = {"User": args.users, "Product": args.products, "Order": args.orders}
+
+    if args.output == "-":
+        written = write_copy_sql(sys.stdout, fixtures, counts)
+    else:
+        with open(args.output, "w", encoding="utf-8", newline="\n") as f:
+            written = write_copy_sql(f, fixtures, counts)
+
+    for clause, rows in unmapped.items():
+        print(f"⚠️ 対応するレコードがない前提条件: {clause}（{', '.join(rows)}）", file=sys.stderr)
+    summary = ", ".join(f"{name} {rows}件" for name, rows in written.items())
+    print(f"✅ フィクスチャを書き出しました（{summary}）: {args.output}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+変更されたファイルから影響を受けるテストケースの選択
+
+`git diff --name-only` などで得た変更ファイルの一覧を、あらかじめ作っておいた
+ファイル → エンドポイント → シート → 行 の索引で引き、影響を受ける行だけを
+小さなワークブック（.xlsx）や JSON Lines などに書き出す。
+
+ファイルからエンドポイントへは次のように対応付ける。
+  - app/api/**/route.ts はそのルートのエンドポイント
+  - それ以外のソースは、そのファイルを（間接的にでも）import しているファイルを含めた中の
+    route.ts と fetch("/api/...") の呼び出し（contexts/CartContext.tsx -> app/checkout/page.tsx
+    -> POST /api/orders など）
+  - カタログのJSONはそのシートの全行、prisma/schema.prisma はスキーマから生成した行
+
+索引は対象ファイルの更新日時とサイズが変わらない限りキャッシュを使うため、選択は
+索引の読み込みと辞書の参照だけで終わる。
+
+    git diff --name-only main | python -m testcases.impact -o 影響テストケース.xlsx
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+from testcases.cache import DEFAULT_CACHE_DIR
+from testcases.catalog import CATALOG_DIR, list_sheets
+from testcases.coverage import RouteIndex, build_coverage
+from testcases.exporters import EXPORTERS, export_test_cases
+from testcases.routes import API_DIR, METHODS, REPO_ROOT, RouteScanner
+from testcases.schema import REMARKS as SCHEMA_REMARKS
+from testcases.schema import SCHEMA_PATH
+from testcases.writer import create_test_cases_excel
+
+# 索引の形式を変えたら上げる（古いキャッシュを使わないようにする）
+INDEX_VERSION = 1
+
+# import と fetch を調べるソース（リポジトリのルートからの glob）
+SOURCE_PATTERNS = (
+    "app/**/*.ts", "app/**/*.tsx", "components/**/*.ts", "components/**/*.tsx",
+    "contexts/**/*.ts", "contexts/**/*.tsx", "lib/**/*.ts", "lib/**/*.tsx", "types/**/*.ts",
+)
+
+# import 先のパスに補う拡張子
+RESOLVE_SUFFIXES = ("", ".ts", ".tsx", "/index.ts", "/index.tsx")
+
+IMPORT_RE = re.compile(r"""(?:\bfrom|\bimport)\s*\(?\s*["']([^"']+)["']""")
+FETCH_RE = re.compile(r"""fetch\(\s*(["'`])(/api/[^"'`?]*)""")
+FETCH_METHOD_RE = re.compile(r"""method:\s*["'](\w+)["']""")
+TEMPLATE_EXPR_RE = re.compile(r"\$\{[^}]*\}")
+
+# fetch のオプションを探す範囲（文字数）
+FETCH_OPTIONS_WINDOW = 300
+
+def source_files(root=REPO_ROOT, patterns=SOURCE_PATTERNS):
+    files = set()
+    for pattern in patterns:
+        files.update(Path(root).glob(pattern))
+    return sorted(files)
+
+def relative(path, root=REPO_ROOT):
+    return Path(os.path.relpath(Path(path).resolve(), Path(root).resolve())).as_posix()
+
+def resolve_import(root, importer, spec):
+    """import のパス（"@/lib/auth" や "./Foo"）をリポジトリ内のファイルの相対パスにする（外部なら None）"""
+    if spec.startswith("@/"):
+        base = Path(root) / spec[2:]
+    elif spec.startswith("."):
+        base = Path(root) / Path(importer).parent / spec
+    else:
+        return None
+    for suffix in RESOLVE_SUFFIXES:
+        candidate = Path(str(base) + suffix)
+        if candidate.is_file():
+            return relative(candidate, root)
+    return None
+
+def fetch_calls(source):
+    """fetch("/api/...") の呼び出しを (メソッド, パス) で返す（${id} は [id] にする）"""
+    calls = []
+    for match in FETCH_RE.finditer(source):
+        path = TEMPLATE_EXPR_RE.sub("[id]", match.group(2)).rstrip("/")
+        window = source[match.end():match.end() + FETCH_OPTIONS_WINDOW].split("fetch(", 1)[0]
+        option = FETCH_METHOD_RE.search(window)
+        method = option.group(1).upper() if option else "GET"
+        if method in METHODS:
+            calls.append((method, path))
+    return calls
+
+def index_fingerprint(root, catalog_dir):
+    """索引の元になるファイルの (パス, 更新日時, サイズ) のハッシュ"""
+    h = hashlib.sha256(f"{INDEX_VERSION}\n{Path(catalog_dir).resolve()}\n".encode())
+    paths = [*source_files(root), *sorted(Path(catalog_dir).glob("*.json")), SCHEMA_PATH]
+    for path in paths:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        h.update(f"{path}\t{stat.st_mtime_ns}\t{stat.st_size}\n".encode())
+    return h.hexdigest()
+
+def build_index(root=REPO_ROOT, catalog_dir=CATALOG_DIR, api_dir=API_DIR, use_cache=True):
+    """ファイル → エンドポイント → 行 の索引を作る（use_cache=False なら route.ts の解析結果もキャッシュしない）"""
+    endpoints = RouteScanner(api_dir, use_cache=use_cache).scan()
+    route_index = RouteIndex(endpoints)
+
+    # 各ファイルが直接参照しているエンドポイントと、import の逆向きの辺
+    direct, importers = {}, {}
+    for path in source_files(root):
+        rel = relative(path, root)
+        source = path.read_text(encoding="utf-8")
+        for spec in IMPORT_RE.findall(source):
+            target = resolve_import(root, rel, spec)
+            if target and target != rel:
+                importers.setdefault(target, set()).add(rel)
+        keys = {f"{e['method']} {e['path']}" for e in endpoints if e["file"] == rel}
+        for method, call_path in fetch_calls(source):
+            route = route_index.lookup(method, call_path)
+            if route:
+                keys.add(f"{route['method']} {route['path']}")
+        direct[rel] = keys
+
+    # import しているファイルをたどり、影響するエンドポイントを集める
+    files = {}
+    for rel in direct:
+        seen, stack, keys = {rel}, [rel], set()
+        while stack:
+            current = stack.pop()
+            keys |= direct.get(current, set())
+            for importer in importers.get(current, ()):
+                if importer not in seen:
+                    seen.add(importer)
+                    stack.append(importer)
+        if keys:
+            files[rel] = sorted(keys)
+
+    sheets = list_sheets(catalog_dir)
+    coverage, _ = build_coverage(sheets, endpoints)
+    schema_rows = {}
+    for sheet in sheets:
+        nos = [test_case.no for test_case in sheet.cases() if test_case.remarks == SCHEMA_REMARKS]
+        if nos:
+            schema_rows[sheet.title] = nos
+    return {
+        "files": files,
+        "endpoints": {f"{method} {path}": [[row["sheet"], row["no"]] for row in rows]
+                      for (method, path), rows in coverage.items() if rows},
+        "catalog": {relative(sheet.path, root): sheet.title for sheet in sheets},
+        "schema": {"file": relative(SCHEMA_PATH, root), "rows": schema_rows},
+    }
+
+def load_index(root=REPO_ROOT, catalog_dir=CATALOG_DIR, cache_path=DEFAULT_CACHE_DIR / "impact.json",
+               use_cache=True):
+    """キャッシュ済みの索引を返す（元のファイルが変わっていれば作り直す）"""
+    fingerprint = index_fingerprint(root, catalog_dir)
+    cache_path = Path(cache_path)
+    if use_cache:
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get("fingerprint") == fingerprint:
+                return cached["index"]
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+
+    index = build_index(root, catalog_dir, use_cache=use_cache)
+    if use_cache:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": fingerprint, "index": index}, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    return index
+
+def select_rows(index, changed_files):
+    """変更ファイルごとの影響（エンドポイントの一覧または "全行" などの説明）と、
+    シート名 → 選ばれた No の集合（None は全行）を返す"""
+    impacts = {}
+    selected = {}
+
+    def add(title, nos):
+        if nos is None or selected.get(title, set()) is None:
+            selected[title] = None
+        else:
+            selected.setdefault(title, set()).update(nos)
+
+    for rel in changed_files:
+        if rel in index["catalog"]:
+            add(index["catalog"][rel], None)
+            impacts[rel] = ["シートの全行"]
+        elif rel == index["schema"]["file"]:
+            for title, nos in index["schema"]["rows"].items():
+                add(title, nos)
+            impacts[rel] = ["スキーマから生成した行"]
+        else:
+            keys = index["files"].get(rel, [])
+            for key in keys:
+                for title, no in index["endpoints"].get(key, []):
+                    add(title, [no])
+            impacts[rel] = keys
+    return impacts, selected
+
+class SelectedSheet:
+    """カタログのシートのうち、選ばれた No の行だけを返すシート"""
+
+    def __init__(self, sheet, nos=None):
+        self.sheet = sheet
+        self.nos = nos
+
+    @property
+    def key(self):
+        return self.sheet.key
+
+    @property
+    def title(self):
+        return self.sheet.title
+
+    def test_cases(self):
+        for test_case in self.sheet.test_cases():
+            if self.nos is None or test_case[0] in self.nos:
+                yield test_case
+
+def selected_sheets(selected, catalog_dir=CATALOG_DIR):
+    """選ばれた行を持つシートを宣言順に返す"""
+    return [SelectedSheet(sheet, selected[sheet.title])
+            for sheet in list_sheets(catalog_dir) if sheet.title in selected]
+
+def main():
+    parser = argparse.ArgumentParser(description="変更されたファイルから影響を受けるテストケースを選びます")
+    parser.add_argument("files", nargs="*", metavar="FILE",
+                        help="変更されたファイル（リポジトリのルートからのパス）。省略時は標準入力から1行ずつ読む")
+    parser.add_argument("-o", "--output",
+                        help=f"選んだ行を書き出すファイル（.xlsx, {', '.join(EXPORTERS)}）")
+    parser.add_argument("--catalog", default=CATALOG_DIR, help="テストケースカタログのディレクトリ")
+    parser.add_argument("--no-cache", action="store_true", help="索引のキャッシュを使わずに作り直す")
+    args = parser.parse_args()
+
+    files = args.files or [line.strip() for line in sys.stdin if line.strip()]
+    changed = [relative(path) if os.path.isabs(path) else Path(path).as_posix() for path in files]
+
+    index = load_index(catalog_dir=args.catalog, use_cache=not args.no_cache)
+    impacts, selected = select_rows(index, changed)
+    sheets = selected_sheets(selected, args.catalog)
+
+    for rel, keys in impacts.items():
+        print(f"{rel}: {', '.join(keys) if keys else '影響するテストケースなし'}")
+    for sheet in sheets:
+        rows = "全行" if sheet.nos is None else f"{len(sheet.nos)}行"
+        print(f"  {sheet.title}: {rows}")
+
+    if args.output and sheets:
+        if args.output.endswith(".xlsx"):
+            create_test_cases_excel(args.output, streaming=True, sheets=sheets)
+        else:
+            try:
+                exporters = export_test_cases(sheets, [args.output])
+            except ValueError as e:
+                parser.error(str(e))
+            except ImportError as e:
+                print(f"❌ {e}")
+                sys.exit(1)
+            print(f"✅ テストケースを書き出しました（{exporters[0].rows}行）: {args.output}")
+    print(f"✅ 影響を受けるシート: {len(sheets)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+「入力データ」列の解析
+
+"email: 空, password: 'test123', items: [{id: 'product-id', quantity: 1}]" のような
+JavaScriptのオブジェクトに近い記法を、キーと値の組に変換する。
+"空" は未入力を表す EMPTY に、null / true / false / 数値はそれぞれPythonの値になる。
+"GET /api/products" のような、キーと値の組でない入力データは解析できない（None を返す）。
+"""
+
+import re
+
+class _Empty:
+    """未入力（"空"）を表す値"""
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __repr__(self):
+        return "EMPTY"
+
+    def __bool__(self):
+        return False
+
+    def __reduce__(self):
+        return (_Empty, ())
+
+EMPTY = _Empty()
+
+HTTP_CALL_RE = re.compile(r"^(GET|POST|PUT|PATCH|DELETE)\s+(/\S*)$")
+KEY_RE = re.compile(r"\s*([A-Za-z_$][\w$.]*)\s*:\s*")
+NUMBER_RE = re.compile(r"-?\d+(?:\.\d+)?(?=\s*(?:[,}\]]|$))")
+BARE_RE = re.compile(r"[^,}\]]*")
+WORDS = {"空": EMPTY, "null": None, "true": True, "false": False}
+
+class _Parser:
+
+    def __init__(self, text):
+        self.text = text
+        self.pos = 0
+
+    def skip_spaces(self):
+        while self.pos < len(self.text) and self.text[self.pos].isspace():
+            self.pos += 1
+
+    def peek(self):
+        self.skip_spaces()
+        return self.text[self.pos] if self.pos < len(self.text) else ""
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"'{char}' が必要です（位置 {self.pos}）")
+        self.pos += 1
+
+    def pairs(self, closing=""):
+        result = {}
+        while True:
+            match = KEY_RE.match(self.text, self.pos)
+            if not match:
+                raise ValueError(f"キーが必要です（位置 {self.pos}）")
+            self.pos = match.end()
+            result[match.group(1)] = self.value()
+            char = self.peek()
+            if char == ",":
+                self.pos += 1
+                if closing and self.peek() == closing:
+                    break
+                continue
+            if char == closing:
+                break
+            raise ValueError(f"',' が必要です（位置 {self.pos}）")
+        return result
+
+    def value(self):
+        char = self.peek()
+        if char in ("'", '"'):
+            end = self.text.find(char, self.pos + 1)
+            if end < 0:
+                raise ValueError("文字列が閉じていません")
+            value = self.text[self.pos + 1:end]
+            self.pos = end + 1
+            # 'admin-user-id'（自分自身） のような補足は読み飛ばす
+            self.pos = BARE_RE.match(self.text, self.pos).end()
+            return value
+        if char == "[":
+            self.pos += 1
+            items = []
+            while self.peek() != "]":
+                items.append(self.value())
+                if self.peek() == ",":
+                    self.pos += 1
+                elif self.peek() != "]":
+                    raise ValueError(f"',' が必要です（位置 {self.pos}）")
+            self.pos += 1
+            return items
+        if char == "{":
+            self.pos += 1
+            if self.peek() == "}":
+                self.pos += 1
+                return {}
+            value = self.pairs(closing="}")
+            self.expect("}")
+            return value
+        match = NUMBER_RE.match(self.text, self.pos)
+        if match:
+            self.pos = match.end()
+            number = match.group(0)
+            return float(number) if "." in number else int(number)
+        match = BARE_RE.match(self.text, self.pos)
+        self.pos = match.end()
+        word = match.group(0).strip()
+        return WORDS.get(word, word)
+
+def parse_input_data(text):
+    """入力データをキーと値の辞書に変換する（キーと値の組でなければ None）"""
+    if not text or not KEY_RE.match(text):
+        return None
+    parser = _Parser(text)
+    try:
+        result = parser.pairs()
+    except ValueError:
+        return None
+    if parser.peek():
+        return None
+    return result
+
+def parse_http_call(text):
+    """「GET /api/products」形式の入力データを (メソッド, パス) に分解する（該当しなければ None）"""
+    match = HTTP_CALL_RE.match(text.strip()) if text else None
+    return (match.group(1), match.group(2)) if match else None
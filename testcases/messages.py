@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+期待結果のエラーメッセージがソースコードに残っているかの確認
+
+「期待結果」が "エラー: " で始まる行のメッセージを集め、app/**/*.ts(x) と lib/*.ts に
+そのメッセージがまだ存在するかを確かめる。メッセージが変わったのにカタログが
+古いままになっている行を見つけるためのもの。
+
+全メッセージから Aho-Corasick のオートマトンを1つ作り、各ファイルを1回だけ読んで
+すべてのメッセージを同時に探すため、メッセージ数が増えてもファイルの読み直しは起きない。
+「XXX」を含むメッセージは XXX で区切った断片がすべて同じファイルにあれば一致とみなす。
+
+    python -m testcases.messages --json stale_messages.json
+"""
+
+import argparse
+import json
+import sys
+from collections import deque
+from pathlib import Path
+
+from testcases.catalog import CATALOG_DIR, select_sheets
+from testcases.schema import REMARKS as SCHEMA_REMARKS
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# 走査するソース（リポジトリのルートからの glob）
+SOURCE_PATTERNS = ("app/**/*.ts", "app/**/*.tsx", "lib/*.ts")
+
+ERROR_PREFIX = "エラー: "
+PLACEHOLDER = "XXX"
+
+class AhoCorasick:
+    """複数の文字列を1回の走査で探すオートマトン"""
+
+    def __init__(self, patterns):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        for pid, pattern in enumerate(patterns):
+            node = 0
+            for char in pattern:
+                next_node = self.goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self.goto)
+                    self.goto[node][char] = next_node
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                node = next_node
+            self.output[node].append(pid)
+
+        # 幅優先で失敗遷移を求め、失敗先の出力を引き継ぐ
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[child] = target if target != child else 0
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def search(self, text):
+        """text に現れるパターンの番号の集合を返す"""
+        goto, fail, output = self.goto, self.fail, self.output
+        found = set()
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if output[node]:
+                found.update(output[node])
+        return found
+
+def expected_messages(sheets):
+    """期待結果のエラーメッセージと、それを期待している行の対応を返す
+
+    prisma/schema.prisma から生成した行は、Prismaのエラーの種類を書いたもので
+    ソースコードのメッセージではないため対象にしない。
+    """
+    messages = {}
+    for sheet in sheets:
+        for test_case in sheet.cases():
+            expected = test_case.expected
+            if not expected.startswith(ERROR_PREFIX) or test_case.remarks == SCHEMA_REMARKS:
+                continue
+            message = expected[len(ERROR_PREFIX):].strip()
+            messages.setdefault(message, []).append({"sheet": sheet.title, "no": test_case.no})
+    return messages
+
+def source_files(root=REPO_ROOT, patterns=SOURCE_PATTERNS):
+    files = set()
+    for pattern in patterns:
+        files.update(Path(root).glob(pattern))
+    return sorted(files)
+
+def find_stale_messages(messages, files):
+    """どのファイルにも見つからないメッセージを返す"""
+    fragments = {}
+    message_fragments = {}
+    for message in messages:
+        parts = [part for part in message.split(PLACEHOLDER) if part]
+        message_fragments[message] = [fragments.setdefault(part, len(fragments)) for part in parts]
+    automaton = AhoCorasick(list(fragments))
+
+    remaining = set(messages)
+    for path in files:
+        if not remaining:
+            break
+        found = automaton.search(path.read_text(encoding="utf-8"))
+        remaining = {message for message in remaining
+                     if not all(pid in found for pid in message_fragments[message])}
+    return sorted(remaining)
+
+def main():
+    parser = argparse.ArgumentParser(description="期待結果のエラーメッセージがソースコードに存在するか確認します")
+    parser.add_argument("--catalog", default=CATALOG_DIR, help="テストケースカタログのディレクトリ")
+    parser.add_argument("--root", default=REPO_ROOT, help="ソースコードのルートディレクトリ")
+    parser.add_argument("--json", help="見つからなかったメッセージを書き出すJSONファイル")
+    args = parser.parse_args()
+
+    messages = expected_messages(select_sheets(catalog_dir=args.catalog))
+    files = source_files(args.root)
+    stale = find_stale_messages(messages, files)
+
+    for message in stale:
+        rows = ", ".join(f"{row['sheet']} No.{row['no']}" for row in messages[message])
+        print(f"❌ {message}（{rows}）")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([{"message": message, "rows": messages[message]} for message in stale],
+                      f, ensure_ascii=False, indent=2)
+
+    if stale:
+        print(f"ソースコードに見つからないメッセージ: {len(stale)}/{len(messages)}件（{len(files)}ファイルを走査）")
+        sys.exit(1)
+    print(f"✅ {len(messages)}件のメッセージがすべてソースコードに存在します（{len(files)}ファイルを走査）")
+
+if __name__ == "__main__":
+    main()
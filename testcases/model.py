@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+テストケース1行のモデル
+
+カタログの行（見出しの7列の文字列のリスト）を、列ごとの属性を持つ TestCase にする。
+属性は __slots__ で持ち、テスト種別・前提条件・期待結果・備考・エンドポイントのように
+多くの行で同じ値になる文字列は intern して共有するため、大きなカタログでも1行あたりの
+メモリが少なく済む。入力データは最初に参照されたときに1回だけ解析して保持する。
+
+TestCase は7列のシーケンスとしても扱えるため、行を list で受け取っていた処理にそのまま渡せる。
+"""
+
+import sys
+
+from testcases.inputs import parse_http_call, parse_input_data
+
+# 見出し（testcases.catalog.HEADERS）の順の属性名
+FIELDS = ("no", "item", "kind", "precondition", "input_data", "expected", "remarks")
+
+# intern する列（同じ値が繰り返し現れる列）
+INTERNED_FIELDS = ("kind", "precondition", "expected", "remarks")
+
+_UNPARSED = object()
+
+class TestCase:
+    """テストケース1行"""
+
+    __slots__ = FIELDS + ("endpoint", "_inputs")
+
+    def __init__(self, no, item, kind, precondition, input_data, expected, remarks, endpoint=None):
+        self.no = no
+        self.item = item
+        self.kind = sys.intern(kind)
+        self.precondition = sys.intern(precondition)
+        self.input_data = input_data
+        self.expected = sys.intern(expected)
+        self.remarks = sys.intern(remarks)
+        self.endpoint = sys.intern(endpoint) if endpoint else None
+        self._inputs = _UNPARSED
+
+    @classmethod
+    def from_row(cls, row, endpoint=None):
+        """カタログの行（7列のリスト）から作る"""
+        return cls(*row, endpoint=endpoint)
+
+    @property
+    def inputs(self):
+        """入力データを解析したキーと値の辞書（"空" は EMPTY、キーと値の組でなければ None）
+
+        解析結果は共有されるため、書き換える場合は複製して使う。
+        """
+        if self._inputs is _UNPARSED:
+            self._inputs = parse_input_data(self.input_data)
+        return self._inputs
+
+    @property
+    def http_call(self):
+        """「GET /api/products」形式の入力データなら (メソッド, パス)、そうでなければ None"""
+        return parse_http_call(self.input_data)
+
+    def to_row(self):
+        return [getattr(self, field) for field in FIELDS]
+
+    def __iter__(self):
+        return (getattr(self, field) for field in FIELDS)
+
+    def __len__(self):
+        return len(FIELDS)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.to_row()[index]
+        return getattr(self, FIELDS[index])
+
+    def __eq__(self, other):
+        if not isinstance(other, TestCase):
+            return NotImplemented
+        return self.to_row() == other.to_row() and self.endpoint == other.endpoint
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"TestCase(no={self.no!r}, item={self.item!r})"
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+組み合わせテストケースの生成（ペアワイズ / t-wise）
+
+項目ごとの値のクラス（正常・未入力・文字数不足・形式不正など）から、
+t項目間のすべての値の組み合わせを少なくとも1回含むテストケースを生成する。
+被覆配列は IPOG（In-Parameter-Order-General）法で構築するため、
+20項目 × 10値程度のペアワイズでも数秒以内に終わる。
+
+カタログのシート定義には次の形式で記述する。
+
+    "combinations": [
+      {
+        "name": "ユーザー登録 - 組み合わせ",
+        "test_type": "相関",
+        "precondition": "なし",
+        "strength": 2,
+        "fields": {
+          "email": {"valid": "'test@example.com'", "empty": "空", "malformed": "'invalid-email'"},
+          "password": {"valid": "'test123'", "short": "'test1'"}
+        },
+        "rules": [
+          {"when": {"email": ["empty"]}, "expected": "エラー: ..."}
+        ],
+        "expected": "ユーザー登録が完了しました"
+      }
+    ]
+
+各項目の最初のクラスを正常値として扱う。期待結果は rules を上から順に評価し、
+いずれかの項目が指定したクラスになっている最初のルールの expected を使う。
+どのルールにも当たらない場合は expected を使う。
+"""
+
+from itertools import combinations, product
+
+# 値のクラスの表示名（テスト項目名に使う）
+CLASS_LABELS = {
+    "valid": "正常",
+    "empty": "未入力",
+    "short": "文字数不足",
+    "long": "文字数超過",
+    "malformed": "形式不正",
+    "unknown": "未登録",
+    "wrong": "不一致",
+    "zero": "0",
+    "negative": "負の値",
+    "out_of_stock": "在庫不足",
+    "free_shipping": "送料無料",
+    "guest": "ゲスト",
+}
+
+DEFAULT_STRENGTH = 2
+
+def covering_array(domain_sizes, strength=DEFAULT_STRENGTH):
+    """t-wise 被覆配列を作る
+
+    domain_sizes[i] は i 番目の項目が取りうる値の数。
+    戻り値は各項目の値の番号（0 始まり）のタプルのリスト。
+    決まった入力からは常に同じ結果を返す。
+    """
+    n = len(domain_sizes)
+    if n == 0:
+        return []
+    if any(size <= 0 for size in domain_sizes):
+        raise ValueError("すべての項目に1つ以上の値が必要です")
+    t = max(1, min(strength, n))
+
+    # 値の多い項目から順に処理すると行数が少なくなる
+    order = sorted(range(n), key=lambda i: (-domain_sizes[i], i))
+    sizes = [domain_sizes[i] for i in order]
+
+    # 最初の t 項目は全組み合わせ
+    rows = [list(values) for values in product(*(range(size) for size in sizes[:t]))]
+
+    for i in range(t, n):
+        # 項目 i と、それより前の t-1 項目の組み合わせのうち未被覆のもの
+        uncovered = {
+            cols: set(product(*(range(sizes[c]) for c in cols), range(sizes[i])))
+            for cols in combinations(range(i), t - 1)
+        }
+
+        # 水平方向の拡張: 既存の各行に、未被覆の組み合わせを最も多く含む値を割り当てる
+        for row in rows:
+            best_value, best_hits = 0, None
+            for value in range(sizes[i]):
+                hits = []
+                for cols, remaining in uncovered.items():
+                    key = tuple(row[c] for c in cols)
+                    if None in key:
+                        continue
+                    key += (value,)
+                    if key in remaining:
+                        hits.append((cols, key))
+                if best_hits is None or len(hits) > len(best_hits):
+                    best_value, best_hits = value, hits
+            row.append(best_value)
+            for cols, key in best_hits:
+                uncovered[cols].discard(key)
+
+        # 垂直方向の拡張: 残った組み合わせを未確定（None）の値を持つ行に詰め、なければ行を追加する
+        open_rows = [row for row in rows if None in row]
+        for cols, remaining in uncovered.items():
+            positions = cols + (i,)
+            for key in sorted(remaining):
+                for row in open_rows:
+                    if all(row[p] is None or row[p] == v for p, v in zip(positions, key)):
+                        break
+                else:
+                    row = [None] * (i + 1)
+                    rows.append(row)
+                    open_rows.append(row)
+                for p, v in zip(positions, key):
+                    row[p] = v
+                if None not in row:
+                    open_rows.remove(row)
+
+    # 未確定の値は最初の値（正常値）で埋め、元の項目順に戻す
+    result = []
+    for row in rows:
+        values = [0 if v is None else v for v in row]
+        original = [0] * n
+        for pos, i in enumerate(order):
+            original[i] = values[pos]
+        result.append(tuple(original))
+    return result
+
+def expand_combinations(spec, start_no=1):
+    """組み合わせ定義からテストケース行を生成する（No は start_no から連番）"""
+    fields = list(spec["fields"].items())
+    names = [name for name, _ in fields]
+    classes = [list(domain.items()) for _, domain in fields]
+    rules = spec.get("rules", [])
+    strength = spec.get("strength", DEFAULT_STRENGTH)
+    remarks = spec.get("remarks", "ペアワイズ生成" if strength == 2 else f"{strength}-wise生成")
+
+    for no, indexes in enumerate(covering_array([len(c) for c in classes], strength), start_no):
+        chosen = {name: classes[f][idx][0] for f, (name, idx) in enumerate(zip(names, indexes))}
+        input_data = ", ".join(
+            f"{name}: {classes[f][idx][1]}" for f, (name, idx) in enumerate(zip(names, indexes)))
+
+        invalid = [(name, cls) for f, (name, cls) in enumerate(chosen.items())
+                   if cls != classes[f][0][0]]
+        if invalid:
+            item = "・".join(f"{name}{CLASS_LABELS.get(cls, cls)}" for name, cls in invalid)
+        else:
+            item = "すべて正常"
+
+        yield [
+            str(no),
+            f"組み合わせ: {item}",
+            spec.get("test_type", "相関"),
+            spec.get("precondition", "なし"),
+            input_data,
+            expected_result(chosen, rules, spec.get("expected", "")),
+            remarks,
+        ]
+
+def expected_result(chosen, rules, default):
+    """選ばれた値のクラスに最初に当てはまるルールの期待結果を返す"""
+    for rule in rules:
+        if any(chosen.get(name) in values for name, values in rule["when"].items()):
+            return rule["expected"]
+    return default
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+生成処理のフェーズごとの計測
+
+カタログ読み込み・列幅設定・セル書き込み（スタイル適用）・保存などのフェーズごとに、
+処理時間・セル数・スタイル適用数・tracemalloc のメモリ使用量のピークを記録し、
+JSONのレポートとして書き出す。cProfile の結果も合わせて保存できる。
+ワーカープロセスで計測したフェーズ（並列・キャッシュ使用時のセル書き込みなど）は、それを
+待っていた「シート生成」の内訳として記録し、合計には二重に数えない。
+
+計測しない場合は NULL_PROFILER を使い、行には手を加えない。計測する場合もカタログの行は
+読み切らずに1行ずつ数えながら流すため、ストリーミングモードのメモリ使用量は一定のまま。
+"""
+
+import cProfile
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+class NullProfiler:
+    """計測しないときのプロファイラー（何も記録しない）"""
+
+    enabled = False
+
+    def __init__(self):
+        self._record = {}
+
+    @contextmanager
+    def phase(self, name, sheet=None):
+        yield self._record
+
+    def collect(self, rows, sheet=None):
+        """計測しないときは行を1行ずつ流したままにする"""
+        return rows
+
+    def add(self, records):
+        pass
+
+NULL_PROFILER = NullProfiler()
+
+class Profiler:
+    """フェーズごとの処理時間・セル数・メモリ使用量を記録する"""
+
+    enabled = True
+
+    def __init__(self, trace_memory=True, cprofile=False):
+        self.trace_memory = trace_memory
+        self.phases = []
+        self._cprofile = cProfile.Profile() if cprofile else None
+        self._started = None
+        # collect で行の取り出しにかかった時間の累計（各フェーズの時間から除く）
+        self._read_seconds = 0.0
+        # 計測中のフェーズ名（内側のフェーズやワーカーの記録は外側のフェーズの内訳にする）
+        self._open = []
+
+    def start(self):
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if self._cprofile:
+            self._cprofile.enable()
+        self._started = time.perf_counter()
+
+    def stop(self):
+        self.total_seconds = time.perf_counter() - self._started
+        if self._cprofile:
+            self._cprofile.disable()
+        if self.trace_memory:
+            tracemalloc.stop()
+
+    @contextmanager
+    def phase(self, name, sheet=None):
+        """フェーズを計測する（与えた辞書にセル数などを書き込める）"""
+        record = {"phase": name, "sheet": sheet}
+        if self._open:
+            record["parent"] = self._open[-1]
+        self._open.append(name)
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        read_before = self._read_seconds
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            read = self._read_seconds - read_before
+            record["seconds"] = time.perf_counter() - start - read
+            if self.trace_memory:
+                record["tracemalloc_peak_bytes"] = tracemalloc.get_traced_memory()[1] - base
+            self._open.pop()
+            self.phases.append(record)
+
+    def collect(self, rows, sheet=None):
+        """行を1行ずつ流しながら数え、行の取り出しにかかった時間を「カタログ読み込み」として記録する
+
+        取り出しの時間は、行を消費している側のフェーズ（セル書き込み）の時間から除く。
+        """
+        record = {"phase": "カタログ読み込み", "sheet": sheet, "seconds": 0.0, "rows": 0}
+        self.phases.append(record)
+        iterator = iter(rows)
+        clock = time.perf_counter
+        while True:
+            start = clock()
+            try:
+                row = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                elapsed = clock() - start
+                record["seconds"] += elapsed
+                self._read_seconds += elapsed
+            record["rows"] += 1
+            yield row
+
+    def add(self, records):
+        """ワーカープロセスで計測したフェーズの記録を、計測中のフェーズ（シート生成など）の内訳として加える"""
+        for record in records:
+            if self._open:
+                record["parent"] = self._open[-1]
+            self.phases.append(record)
+
+    def report(self):
+        """phase_totals は外側のフェーズだけの合計（合計すると処理時間になる）、
+        nested_totals は外側のフェーズごとの内訳（ワーカーの記録は全プロセスの合計）"""
+        totals = {}
+        nested = {}
+        for record in self.phases:
+            parent = record.get("parent")
+            target = totals if parent is None else nested.setdefault(parent, {})
+            target[record["phase"]] = target.get(record["phase"], 0) + record["seconds"]
+        return {"total_seconds": self.total_seconds, "phase_totals": totals, "nested_totals": nested,
+                "phases": self.phases}
+
+    def write_report(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+
+    def write_cprofile(self, path):
+        self._cprofile.dump_stats(path)
+
+    def print_summary(self):
+        report = self.report()
+        print(f"計測結果（合計 {report['total_seconds']:.2f} 秒）")
+        for name, seconds in report["phase_totals"].items():
+            print(f"  {name}: {seconds:.2f} 秒")
+            for child, child_seconds in report["nested_totals"].get(name, {}).items():
+                print(f"    {child}: {child_seconds:.2f} 秒")
@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+"""
+APIルートハンドラーからのテストケース下書きの抽出
+
+app/api/**/route.ts を走査し、エクスポートされたHTTPメソッド、必須項目チェック
+（if (!a || !b) { return NextResponse.json({ error: "..." }) }）とエラーメッセージを取り出して、
+エンドポイントごとの単項目テストケースの下書きを作る。
+
+解析結果はファイルごとに更新日時・サイズ・内容のハッシュと一緒にキャッシュし、
+変更のあったファイルだけを解析し直す。
+
+    python -m testcases.routes -o drafts.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+from testcases.cache import DEFAULT_CACHE_DIR
+from testcases.catalog import dump_sheet
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+API_DIR = REPO_ROOT / "app" / "api"
+
+# 解析結果の形式を変えたら上げる（古いキャッシュを使わないようにする）
+PARSER_VERSION = 2
+
+METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE")
+
+METHOD_RE = re.compile(r"export\s+(?:async\s+function\s+|const\s+)(GET|POST|PUT|PATCH|DELETE)\b")
+# export { handler as GET, handler as POST } の形式
+EXPORT_LIST_RE = re.compile(r"export\s*\{([^}]*)\}")
+EXPORT_ALIAS_RE = re.compile(r"([A-Za-z_$][\w$]*)(?:\s+as\s+(GET|POST|PUT|PATCH|DELETE))?\s*$")
+BODY_FIELDS_RE = re.compile(r"const\s*\{([^}]*)\}\s*=\s*(?:await\s+\w+\.json\(\)|body)\s*;")
+REQUIRED_CHECK_RE = re.compile(
+    r"if\s*\(\s*(![^{]*?)\)\s*\{\s*return\s+NextResponse\.json\(\s*\{\s*error:\s*([\"'`])(.*?)\2"
+    r".*?status:\s*(\d+)",
+    re.S,
+)
+ERROR_RE = re.compile(
+    r"NextResponse\.json\(\s*\{\s*error:\s*([\"'`])(.*?)\1.*?status:\s*(\d+)",
+    re.S,
+)
+NEGATED_NAME_RE = re.compile(r"!\s*([A-Za-z_$][\w$]*)")
+TEMPLATE_EXPR_RE = re.compile(r"\$\{[^}]*\}")
+
+# 下書きの入力データに使うサンプル値
+SAMPLE_VALUES = {
+    "email": "'test@example.com'",
+    "password": "'test123'",
+    "name": "'テスト太郎'",
+    "phone": "'090-1234-5678'",
+    "price": "'¥10,000'",
+    "slug": "'test-product'",
+    "reason": "'確認のため'",
+    "status": "'shipped'",
+}
+
+def route_path(path, api_dir=API_DIR):
+    """route.ts のパスからURLのパスを求める（app/api/auth/register/route.ts -> /api/auth/register）"""
+    rel = Path(path).resolve().parent.relative_to(Path(api_dir).resolve().parent)
+    return "/" + rel.as_posix()
+
+def method_blocks(source):
+    """エクスポートされたメソッドと、そのハンドラーの定義部分のソースの組を返す
+
+    export async function GET() {...} の形式は次のエクスポートまでを、
+    export { handler as GET } の形式は handler の定義からエクスポート文までを定義部分とする。
+    """
+    exports = list(METHOD_RE.finditer(source))
+    blocks = []
+    for idx, match in enumerate(exports):
+        end = exports[idx + 1].start() if idx + 1 < len(exports) else len(source)
+        blocks.append((match.group(1), source[match.start():end]))
+
+    for export in EXPORT_LIST_RE.finditer(source):
+        for item in export.group(1).split(","):
+            alias = EXPORT_ALIAS_RE.match(item.strip())
+            if not alias:
+                continue
+            local, method = alias.group(1), alias.group(2) or alias.group(1)
+            if method not in METHODS:
+                continue
+            definition = re.search(rf"(?:function\s+|const\s+|let\s+|var\s+){re.escape(local)}\b",
+                                   source[:export.start()])
+            start = definition.start() if definition else export.start()
+            blocks.append((method, source[start:export.start()]))
+    return blocks
+
+def parse_route_source(source):
+    """route.ts のソースからメソッドごとの定義を取り出す"""
+    endpoints = []
+    for method, block in method_blocks(source):
+
+        body_fields = []
+        for fields in BODY_FIELDS_RE.findall(block):
+            for field in fields.split(","):
+                # "a: b" や "a = 1" は元のキー名を使う
+                name = re.split(r"[:=]", field)[0].strip()
+                if name and name not in body_fields:
+                    body_fields.append(name)
+
+        required = []
+        for condition, _, message, status in REQUIRED_CHECK_RE.findall(block):
+            names = []
+            for name in NEGATED_NAME_RE.findall(condition):
+                if name in body_fields and name not in names:
+                    names.append(name)
+            if names:
+                required.append({"fields": names, "message": clean_message(message), "status": int(status)})
+
+        required_messages = {check["message"] for check in required}
+        errors = []
+        for _, message, status in ERROR_RE.findall(block):
+            message = clean_message(message)
+            if message in required_messages or any(e["message"] == message for e in errors):
+                continue
+            errors.append({"message": message, "status": int(status)})
+
+        endpoints.append({
+            "method": method,
+            "body_fields": body_fields,
+            "required": required,
+            "errors": errors,
+        })
+    return endpoints
+
+def clean_message(message):
+    """テンプレートリテラルの埋め込み式をカタログと同じ「XXX」に置き換える"""
+    return TEMPLATE_EXPR_RE.sub("XXX", message)
+
+class RouteScanner:
+    """route.ts の解析結果をファイル単位でキャッシュしながら走査する"""
+
+    def __init__(self, api_dir=API_DIR, cache_path=DEFAULT_CACHE_DIR / "routes.json", use_cache=True):
+        self.api_dir = Path(api_dir)
+        self.cache_path = Path(cache_path)
+        self.use_cache = use_cache
+        self.parsed = 0
+        self.reused = 0
+
+    def _load_cache(self):
+        if not self.use_cache:
+            return {}
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                cache = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        if cache.get("version") != PARSER_VERSION:
+            return {}
+        return cache.get("files", {})
+
+    def _save_cache(self, files):
+        if not self.use_cache:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": PARSER_VERSION, "files": files}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.cache_path)
+
+    def scan(self):
+        """全エンドポイントをパスとメソッドの順に返す"""
+        cached = self._load_cache()
+        files = {}
+        self.parsed = self.reused = 0
+
+        for path in sorted(self.api_dir.rglob("route.ts")):
+            rel = path.relative_to(REPO_ROOT).as_posix()
+            stat = path.stat()
+            entry = cached.get(rel)
+            if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                files[rel] = entry
+                self.reused += 1
+                continue
+
+            data = path.read_bytes()
+            digest = hashlib.sha256(data).hexdigest()
+            if entry and entry["sha256"] == digest:
+                # 更新日時だけが変わった場合は解析し直さない
+                entry.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+                files[rel] = entry
+                self.reused += 1
+                continue
+
+            endpoints = parse_route_source(data.decode("utf-8"))
+            for endpoint in endpoints:
+                endpoint["path"] = route_path(path, self.api_dir)
+                endpoint["file"] = rel
+            files[rel] = {
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "sha256": digest,
+                "endpoints": endpoints,
+            }
+            self.parsed += 1
+
+        self._save_cache(files)
+        endpoints = [endpoint for entry in files.values() for endpoint in entry["endpoints"]]
+        endpoints.sort(key=lambda e: (e["path"], METHODS.index(e["method"])))
+        return endpoints
+
+def draft_test_cases(endpoint, start_no=1):
+    """1エンドポイント分の下書きテストケース行を生成する"""
+    label = f"{endpoint['method']} {endpoint['path']}"
+    remarks = f"{label} から自動抽出（下書き）"
+    no = start_no
+
+    if endpoint["method"] == "GET":
+        yield [str(no), "正常な取得", "単項目", "要確認", label, "200: 取得できる（要確認）", remarks]
+        no += 1
+
+    for check in endpoint["required"]:
+        for missing in check["fields"]:
+            input_data = ", ".join(
+                f"{name}: {'空' if name == missing else SAMPLE_VALUES.get(name, repr('テスト'))}"
+                for name in check["fields"])
+            yield [str(no), f"{missing}未入力", "単項目", "なし", input_data,
+                   f"エラー: {check['message']}", remarks]
+            no += 1
+
+    for error in endpoint["errors"]:
+        if error["status"] >= 500:
+            continue
+        yield [str(no), f"エラー応答（{error['status']}）", "単項目", "要確認", label,
+               f"エラー: {error['message']}", remarks]
+        no += 1
+
+def draft_sheet(endpoints):
+    """全エンドポイントの下書きをカタログのシート形式で返す"""
+    groups = []
+    no = 1
+    for endpoint in endpoints:
+        test_cases = list(draft_test_cases(endpoint, no))
+        if not test_cases:
+            continue
+        no += len(test_cases)
+        label = f"{endpoint['method']} {endpoint['path']}"
+        groups.append({"name": label, "endpoint": label, "test_cases": test_cases})
+    return {
+        "title": "API自動抽出（下書き）",
+        "description": "app/api のルートハンドラーから抽出したテストケースの下書き",
+        "groups": groups,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="APIルートハンドラーからテストケースの下書きを抽出します")
+    parser.add_argument("-o", "--output", help="出力するJSONファイル（省略時は標準出力）")
+    parser.add_argument("--api-dir", default=API_DIR, help="走査するディレクトリ")
+    parser.add_argument("--no-cache", action="store_true", help="解析結果のキャッシュを使わない")
+    args = parser.parse_args()
+
+    scanner = RouteScanner(args.api_dir, use_cache=not args.no_cache)
+    sheet = draft_sheet(scanner.scan())
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            dump_sheet(sheet, f)
+    else:
+        dump_sheet(sheet, sys.stdout)
+    print(f"✅ route.ts を走査しました（解析: {scanner.parsed}件, キャッシュ利用: {scanner.reused}件）",
+          file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+prisma/schema.prisma からの相関テストケースの生成
+
+スキーマを1度だけ解析してモデル・フィールド・@unique・@@index・任意項目・リレーションの
+索引を作り、1回の走査で一意制約・必須項目・外部キーのテストケースをモデルごとに生成する。
+カタログのシート定義に "models": ["User", ...] があれば、そのモデルの行がシートに追加される。
+"""
+
+import re
+from functools import lru_cache
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SCHEMA_PATH = REPO_ROOT / "prisma" / "schema.prisma"
+
+SCALAR_TYPES = {"String", "Int", "BigInt", "Float", "Decimal", "Boolean", "DateTime", "Json", "Bytes"}
+
+MODEL_RE = re.compile(r"^model\s+(\w+)\s*\{")
+FIELD_RE = re.compile(r"^(\w+)\s+(\w+)(\[\])?(\?)?\s*(.*)$")
+LIST_ARG_RE = re.compile(r"\[([^\]]*)\]")
+RELATION_ARG_RE = re.compile(r"(fields|references):\s*\[([^\]]*)\]|onDelete:\s*(\w+)")
+DEFAULT_ARG_RE = re.compile(r"@default\(((?:[^()]|\([^()]*\))*)\)")
+
+REMARKS = "prisma/schema.prisma から生成"
+
+class Field:
+    """モデルの1フィールド"""
+
+    def __init__(self, name, type_, is_list=False, optional=False, attributes="", comment=""):
+        self.name = name
+        self.type = type_
+        self.is_list = is_list
+        self.optional = optional
+        self.comment = comment
+        self.is_id = "@id" in attributes
+        self.unique = bool(re.search(r"@unique\b", attributes))
+        self.has_default = "@default(" in attributes or "@updatedAt" in attributes
+        self.updated_at = "@updatedAt" in attributes
+        # @default(...) の中身（"now()", "0", '"pending"' など）
+        match = DEFAULT_ARG_RE.search(attributes)
+        self.default = match.group(1).strip() if match else None
+        self.relation = None
+        if "@relation(" in attributes:
+            self.relation = {"fields": [], "references": [], "on_delete": None}
+            for key, values, on_delete in RELATION_ARG_RE.findall(attributes):
+                if on_delete:
+                    self.relation["on_delete"] = on_delete
+                else:
+                    self.relation[key] = split_names(values)
+
+    @property
+    def is_scalar(self):
+        return self.type in SCALAR_TYPES
+
+class Model:
+    """モデルと、そのフィールド・一意制約・インデックス"""
+
+    def __init__(self, name):
+        self.name = name
+        self.fields = {}
+        self.uniques = []
+        self.indexes = []
+
+    def relations(self):
+        """外部キーを持つリレーションフィールドを返す"""
+        return [f for f in self.fields.values() if f.relation and f.relation["fields"]]
+
+class SchemaIndex:
+    """スキーマ全体のモデルの索引"""
+
+    def __init__(self, models):
+        self.models = models
+
+    def __getitem__(self, name):
+        return self.models[name]
+
+    def __iter__(self):
+        return iter(self.models.values())
+
+def split_names(text):
+    return [name.strip() for name in text.split(",") if name.strip()]
+
+def parse_schema(text):
+    """schema.prisma のテキストを1回走査してモデルの索引を作る"""
+    models = {}
+    current = None
+    for raw_line in text.splitlines():
+        line, _, comment = raw_line.partition("//")
+        line = line.strip()
+        if current is None:
+            match = MODEL_RE.match(line)
+            if match:
+                current = Model(match.group(1))
+                models[current.name] = current
+            continue
+
+        if line.startswith("}"):
+            current = None
+        elif line.startswith("@@unique") or line.startswith("@@index"):
+            match = LIST_ARG_RE.search(line)
+            if match:
+                names = split_names(match.group(1))
+                (current.uniques if line.startswith("@@unique") else current.indexes).append(names)
+        elif line:
+            match = FIELD_RE.match(line)
+            if match:
+                name, type_, is_list, optional, attributes = match.groups()
+                field = Field(name, type_, bool(is_list), bool(optional), attributes, comment.strip())
+                current.fields[name] = field
+                if field.unique:
+                    current.uniques.append([name])
+    return SchemaIndex(models)
+
+@lru_cache(maxsize=None)
+def _load_schema(path, mtime_ns):
+    with open(path, encoding="utf-8") as f:
+        return parse_schema(f.read())
+
+def load_schema(path=SCHEMA_PATH):
+    """スキーマを読み込む（ファイルが変わらない限り解析結果を使い回す）"""
+    path = Path(path)
+    return _load_schema(path, path.stat().st_mtime_ns)
+
+def sample_value(field, prefix):
+    """入力データに使うサンプル値"""
+    if field.type in ("Int", "BigInt", "Float", "Decimal"):
+        return "1"
+    if field.type == "Boolean":
+        return "true"
+    if field.type == "DateTime":
+        return "'2026-01-01T00:00:00Z'"
+    if "email" in field.name.lower():
+        return f"'{prefix}@example.com'"
+    return f"'{prefix}-{field.name}'"
+
+def required_fields(model):
+    """作成時に指定が必要なフィールド（既定値・任意・リスト・リレーションを除く）"""
+    return [f for f in model.fields.values()
+            if f.is_scalar and not (f.optional or f.is_list or f.has_default or f.is_id)]
+
+@lru_cache(maxsize=None)
+def _schema_test_cases(path, mtime_ns):
+    schema = _load_schema(path, mtime_ns)
+    rows_by_model = {}
+    for model in schema:
+        rows = []
+
+        for names in model.uniques:
+            fields = [model.fields[name] for name in names]
+            label = "・".join(names)
+            input_data = ", ".join(f"{f.name}: {sample_value(f, 'existing')}" for f in fields)
+            rows.append([f"{model.name}.{label}の重複", "相関",
+                         f"{model.name} に同じ {label} のレコードが既に存在", input_data,
+                         "エラー: 一意制約違反（Prisma P2002）"])
+
+        required = required_fields(model)
+        for field in required:
+            input_data = ", ".join(
+                f"{f.name}: {'空' if f is field else sample_value(f, 'test')}" for f in required)
+            rows.append([f"{model.name}.{field.name}未指定", "単項目", "なし", input_data,
+                         "エラー: 必須項目が不足しています（PrismaClientValidationError）"])
+
+        for relation in model.relations():
+            target = relation.type
+            for fk_name, ref_name in zip(relation.relation["fields"], relation.relation["references"]):
+                fk = model.fields[fk_name]
+                rows.append([f"存在しない{target}を参照した{model.name}の作成", "相関", "なし",
+                             f"{fk_name}: 'invalid-{ref_name}'",
+                             "エラー: 外部キー制約違反（Prisma P2003）"])
+
+                # onDelete 未指定時はPrismaの既定（必須: Restrict / 任意: SetNull）
+                on_delete = relation.relation["on_delete"] or ("SetNull" if fk.optional else "Restrict")
+                if on_delete == "Cascade":
+                    expected = f"参照している{model.name}も削除される"
+                elif on_delete == "SetNull":
+                    expected = f"{model.name}.{fk_name} が null になる"
+                else:
+                    expected = f"エラー: 参照されている{target}は削除できない（Prisma P2003）"
+                rows.append([f"{model.name}から参照されている{target}の削除", "相関",
+                             f"{target} が存在し、{model.name} から参照されている",
+                             f"{target}.{ref_name}: 'referenced-{ref_name}'", expected])
+
+        rows_by_model[model.name] = rows
+    return rows_by_model
+
+def schema_test_cases(models, start_no=1, path=SCHEMA_PATH):
+    """指定したモデルのテストケース行を No の連番で返す"""
+    path = Path(path)
+    rows_by_model = _schema_test_cases(path, path.stat().st_mtime_ns)
+    no = start_no
+    for name in models:
+        for row in rows_by_model[name]:
+            yield [str(no), *row, REMARKS]
+            no += 1
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+大きなカタログの複数ワークブックへの分割
+
+シートを行数またはバイト数の上限ごとに区切り（チャンク）、チャンクを宣言順に
+上限まで詰めて番号付きのワークブック（シャード）に割り当てる。
+
+区切り位置はシートごとに先頭から決まるため、あるシートの行が変わっても
+他のシートのチャンクは変わらず、チャンク単位のキャッシュをそのまま使える。
+"""
+
+from pathlib import Path
+
+# Excelの1シートの最大行数から見出し行を除いた行数
+EXCEL_MAX_DATA_ROWS = 1_048_576 - 1
+
+# Excelのシート名の最大文字数
+MAX_TITLE_LENGTH = 31
+
+class Chunk:
+    """1シートのうち、1つのシャードに入る連続した行の範囲"""
+
+    def __init__(self, sheet, start, stop, first_no, last_no, size):
+        self.sheet = sheet
+        self.start = start
+        self.stop = stop
+        self.first_no = first_no
+        self.last_no = last_no
+        self.size = size
+        self.part = 1
+        self.parts = 1
+
+    @property
+    def rows(self):
+        return self.stop - self.start
+
+    @property
+    def title(self):
+        """シャード内のシート名（分割したシートは「シート名 (2)」のように番号を付ける）"""
+        if self.parts == 1:
+            return self.sheet.title
+        suffix = f" ({self.part})"
+        return self.sheet.title[:MAX_TITLE_LENGTH - len(suffix)] + suffix
+
+def row_size(test_case):
+    """行の大きさ（UTF-8でのバイト数）"""
+    return sum(len(value.encode("utf-8")) for value in test_case)
+
+def split_sheet(sheet, max_rows=EXCEL_MAX_DATA_ROWS, max_bytes=None):
+    """シートの行を1回走査して、上限ごとのチャンクに区切る（行は保持しない）"""
+    chunks = []
+    start = rows = size = 0
+    first_no = last_no = ""
+    for idx, test_case in enumerate(sheet.test_cases()):
+        this_size = row_size(test_case) if max_bytes else 0
+        if rows and (rows >= max_rows or (max_bytes and size + this_size > max_bytes)):
+            chunks.append(Chunk(sheet, start, idx, first_no, last_no, size))
+            start, rows, size = idx, 0, 0
+        if rows == 0:
+            first_no = test_case[0]
+        last_no = test_case[0]
+        rows += 1
+        size += this_size
+    if rows or not chunks:
+        chunks.append(Chunk(sheet, start, start + rows, first_no, last_no, size))
+
+    for part, chunk in enumerate(chunks, 1):
+        chunk.part, chunk.parts = part, len(chunks)
+    return chunks
+
+def plan_shards(sheets, max_rows=None, max_bytes=None):
+    """シートをチャンクに区切り、宣言順に上限まで詰めたシャード（チャンクのリスト）のリストを返す"""
+    max_rows = min(max_rows or EXCEL_MAX_DATA_ROWS, EXCEL_MAX_DATA_ROWS)
+    shards = []
+    current, rows, size = [], 0, 0
+    for sheet in sheets:
+        for chunk in split_sheet(sheet, max_rows, max_bytes):
+            too_many_rows = rows + chunk.rows > max_rows
+            too_large = max_bytes and size + chunk.size > max_bytes
+            if current and (too_many_rows or too_large):
+                shards.append(current)
+                current, rows, size = [], 0, 0
+            current.append(chunk)
+            rows += chunk.rows
+            size += chunk.size
+    if current:
+        shards.append(current)
+    return shards
+
+def shard_filename(filename, number):
+    """シャードのファイル名（単体テストケース一覧.xlsx -> 単体テストケース一覧_001.xlsx）"""
+    path = Path(filename)
+    return str(path.with_name(f"{path.stem}_{number:03d}{path.suffix}"))
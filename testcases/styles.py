@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+テストケースのワークブック共通のスタイル
+
+見出し・中央揃え・左揃えの名前付きスタイルと、列幅の設定。
+生成スクリプト（generate_test_cases.py）と網羅状況などのレポートで同じ見た目にするために使う。
+"""
+
+from copy import copy
+
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.styles.fonts import DEFAULT_FONT
+from openpyxl.utils import get_column_letter
+
+# 中央揃えにする列番号（No, テスト種別）
+CENTER_COLUMNS = (1, 3)
+
+# 名前付きスタイル
+HEADER_STYLE = "テストケース見出し"
+CENTER_STYLE = "テストケース中央揃え"
+LEFT_STYLE = "テストケース左揃え"
+
+def register_named_styles(wb):
+    """シート共通のスタイルを名前付きスタイルとしてワークブックに1度だけ登録する
+
+    セルごとに fill / font / alignment / border を個別に設定すると属性ごとに
+    スタイルの検索とハッシュ計算が走るため、名前付きスタイルをまとめて適用する。
+    """
+    border = Border(
+        left=Side(style='thin'),
+        right=Side(style='thin'),
+        top=Side(style='thin'),
+        bottom=Side(style='thin')
+    )
+    center_alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
+    left_alignment = Alignment(horizontal='left', vertical='top', wrap_text=True)
+    
+    wb.add_named_style(NamedStyle(
+        name=HEADER_STYLE,
+        fill=PatternFill(start_color="366092", end_color="366092", fill_type="solid"),
+        font=Font(bold=True, color="FFFFFF", size=11),
+        alignment=center_alignment,
+        border=border,
+    ))
+    wb.add_named_style(NamedStyle(
+        name=CENTER_STYLE,
+        font=copy(DEFAULT_FONT),
+        alignment=center_alignment,
+        border=border,
+    ))
+    wb.add_named_style(NamedStyle(
+        name=LEFT_STYLE,
+        font=copy(DEFAULT_FONT),
+        alignment=left_alignment,
+        border=border,
+    ))
+    
+    # セルスタイルのID（シートXMLの s 属性）を登録順で固定する。
+    # 別プロセスで書き出したシートXMLをそのまま結合できるようにするため。
+    for name in (HEADER_STYLE, CENTER_STYLE, LEFT_STYLE):
+        wb._cell_styles.add(copy(wb._named_styles[name].as_tuple()))
+
+def set_column_widths(ws, widths):
+    """列幅調整"""
+    for col_num, width in enumerate(widths, 1):
+        ws.column_dimensions[get_column_letter(col_num)].width = width
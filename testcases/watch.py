@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+ファイルの変更の監視
+
+指定したディレクトリとパターンに一致するファイルの更新日時とサイズを一定間隔で調べ、
+追加・変更・削除されたファイルを返す。エディターの保存のように短い間に続けて起きる変更は、
+最後の変更から一定時間たってから1回にまとめて返す（デバウンス）。
+"""
+
+import time
+from pathlib import Path
+
+# ファイルを調べる間隔と、最後の変更から待つ時間（秒）
+POLL_INTERVAL = 0.2
+DEBOUNCE = 0.3
+
+class FileWatcher:
+    """(ディレクトリ, glob パターン) の組で指定したファイルの変更をポーリングで監視する"""
+
+    def __init__(self, targets, interval=POLL_INTERVAL, debounce=DEBOUNCE):
+        self.targets = [(Path(base), pattern) for base, pattern in targets]
+        self.interval = interval
+        self.debounce = debounce
+        self._snapshot = self.snapshot()
+
+    def snapshot(self):
+        """監視対象のファイルごとの (更新日時, サイズ)"""
+        files = {}
+        for base, pattern in self.targets:
+            for path in base.glob(pattern):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                files[path] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    def poll(self):
+        """前回から追加・変更・削除されたファイルの集合"""
+        current = self.snapshot()
+        previous, self._snapshot = self._snapshot, current
+        return {path for path in previous.keys() | current.keys()
+                if previous.get(path) != current.get(path)}
+
+    def changes(self):
+        """変更が落ち着くたびに、その間に変更されたファイルの集合を返し続ける"""
+        pending = set()
+        last_change = 0.0
+        while True:
+            time.sleep(self.interval)
+            changed = self.poll()
+            if changed:
+                pending |= changed
+                last_change = time.monotonic()
+            elif pending and time.monotonic() - last_change >= self.debounce:
+                yield pending
+                pending = set()
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+列幅の自動調整
+
+セルの文字列の表示幅（全角文字を2、半角文字を1として数える）から列幅を求める。
+行を書き出しながら1回の走査で列ごとの最大幅を求めるため、行をメモリに溜めない。
+「単項目」「なし」のように何度も現れる文字列の幅は計算結果を使い回す。
+
+書き込み専用シートでは列幅を行より前に書き出す必要があるため、シートXMLの
+<cols> 要素を書き出し後に差し替える（replace_cols_xml）。
+"""
+
+import re
+import shutil
+from functools import lru_cache
+from unicodedata import east_asian_width
+
+# 列幅の下限・上限（上限を超える文字列は折り返して表示する）
+MIN_COLUMN_WIDTH = 6
+MAX_COLUMN_WIDTH = 60
+
+# 文字列の表示幅に加える余白
+WIDTH_PADDING = 2
+
+COLS_RE = re.compile(rb"<cols>.*?</cols>|<cols\s*/>", re.S)
+
+@lru_cache(maxsize=65536)
+def display_width(text):
+    """文字列の表示幅（全角・曖昧幅の文字は2、それ以外は1。複数行は最も長い行）"""
+    widest = 0
+    for line in text.split("\n"):
+        width = 0
+        for char in line:
+            width += 2 if east_asian_width(char) in "WFA" else 1
+        widest = max(widest, width)
+    return widest
+
+class ColumnSizer:
+    """行を受け取りながら列ごとの最大表示幅を記録する"""
+
+    def __init__(self, headers, min_width=MIN_COLUMN_WIDTH, max_width=MAX_COLUMN_WIDTH):
+        self.max_width = max_width
+        self.widths = [max(min_width, display_width(header) + WIDTH_PADDING) for header in headers]
+
+    def measure(self, row):
+        widths = self.widths
+        for idx, value in enumerate(row):
+            if value is None:
+                continue
+            text = value if isinstance(value, str) else str(value)
+            current = widths[idx]
+            # 全角だけでも今の幅に収まる文字列と、上限に達した列は測らない
+            if current >= self.max_width or len(text) * 2 + WIDTH_PADDING <= current:
+                continue
+            width = display_width(text) + WIDTH_PADDING
+            if width > current:
+                widths[idx] = min(width, self.max_width)
+
+    def track(self, rows):
+        """行をそのまま流しながら幅を測る"""
+        for row in rows:
+            self.measure(row)
+            yield row
+
+    def column_widths(self):
+        return list(self.widths)
+
+def cols_xml(widths):
+    """列幅の <cols> 要素（openpyxl の出力と同じ形式）"""
+    return ("<cols>" + "".join(
+        f'<col width="{width}" customWidth="1" min="{col}" max="{col}" />'
+        for col, width in enumerate(widths, 1)) + "</cols>").encode()
+
+def replace_cols_xml(src, dst, widths, chunk_size=1 << 16):
+    """シートXMLを src から dst へコピーしながら、<cols> 要素を widths の列幅に差し替える
+
+    <cols> は <sheetData> より前にあるため、先頭部分だけを書き換えて残りはそのままコピーする。
+    """
+    head = b""
+    while b"<sheetData" not in head:
+        chunk = src.read(chunk_size)
+        if not chunk:
+            break
+        head += chunk
+    index = head.find(b"<sheetData")
+    if index < 0:
+        dst.write(head)
+        return
+    before, after = head[:index], head[index:]
+    if COLS_RE.search(before):
+        before = COLS_RE.sub(cols_xml(widths), before, count=1)
+    else:
+        before += cols_xml(widths)
+    dst.write(before)
+    dst.write(after)
+    shutil.copyfileobj(src, dst)
@@ -0,0 +1,346 @@
+# -*- coding: utf-8 -*-
+"""
+実行結果のワークブックへの書き戻し
+
+テストケースの実行結果（testcases.runner の --results で書き出した JSON Lines）を、
+既存の 単体テストケース一覧.xlsx の「結果」「実行時間(ms)」「詳細」列に書き込む。
+
+openpyxl でワークブック全体を読み込んで保存し直すのではなく、結果のあるシートの
+XMLだけを1行ずつ書き換え、それ以外のパーツは圧縮されたままのバイト列をコピーする
+（展開・再圧縮しないため、書き戻しの時間はワークブックの大きさではなく書き換える行の数で決まる）。
+
+    python -m testcases.writeback results.jsonl -w 単体テストケース一覧.xlsx
+"""
+
+import argparse
+import json
+import os
+import posixpath
+import re
+import shutil
+import struct
+import sys
+import tempfile
+import zipfile
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape, unescape
+
+DEFAULT_WORKBOOK = "単体テストケース一覧.xlsx"
+
+# 追加する列（H〜J列）と列幅
+RESULT_HEADERS = ["結果", "実行時間(ms)", "詳細"]
+RESULT_WIDTHS = [10, 14, 40]
+FIRST_RESULT_COLUMN = 8
+
+# testcases.runner の判定結果と、シートに書き込む表記
+RESULT_LABELS = {"PASS": "成功", "FAIL": "失敗", "ERROR": "エラー", "SKIP": "対象外"}
+
+MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PACKAGE_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+CHUNK_SIZE = 1 << 16
+
+ROW_START_RE = re.compile(rb"<row[\s>/]")
+ROW_NUMBER_RE = re.compile(rb'\sr="(\d+)"')
+ROW_SPANS_RE = re.compile(rb'\sspans="[^"]*"')
+CELL_RE = re.compile(rb"<c(\s[^>]*?)(?:/>|>(.*?)</c>)", re.S)
+CELL_REF_RE = re.compile(rb'\sr="([A-Z]+)\d+"')
+CELL_STYLE_RE = re.compile(rb'\ss="(\d+)"')
+CELL_TYPE_RE = re.compile(rb'\st="(\w+)"')
+TEXT_RE = re.compile(rb"<t(?:\s[^>]*)?>(.*?)</t>", re.S)
+VALUE_RE = re.compile(rb"<v>(.*?)</v>", re.S)
+DIMENSION_RE = re.compile(rb'(<dimension ref="[A-Z]+\d+:)([A-Z]+)(\d+")')
+COL_RANGE_RE = re.compile(rb'<col\s[^>]*?min="(\d+)"[^>]*?max="(\d+)"|<col\s[^>]*?max="(\d+)"[^>]*?min="(\d+)"')
+
+def column_index(letters):
+    """列名（b"A", b"AA"）を列番号（1始まり）に変換する"""
+    index = 0
+    for char in letters:
+        index = index * 26 + char - 64
+    return index
+
+def column_letter(index):
+    letters = ""
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+def worksheet_parts(archive):
+    """シート名からシートXMLのパーツ名への対応を返す"""
+    workbook = ET.fromstring(archive.read("xl/workbook.xml"))
+    rels = ET.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    targets = {}
+    for rel in rels.iter(f"{{{PACKAGE_REL_NS}}}Relationship"):
+        target = rel.get("Target")
+        # Target は "/xl/worksheets/sheet1.xml" と "worksheets/sheet1.xml" のどちらもある
+        targets[rel.get("Id")] = target.lstrip("/") if target.startswith("/") \
+            else posixpath.normpath(posixpath.join("xl", target))
+    return {sheet.get("name"): targets[sheet.get(f"{{{REL_NS}}}id")]
+            for sheet in workbook.iter(f"{{{MAIN_NS}}}sheet")}
+
+class SharedStrings:
+    """共有文字列テーブル（t="s" のセルが現れたときに初めて読み込む）"""
+
+    def __init__(self, archive):
+        self.archive = archive
+        self._strings = None
+
+    def __getitem__(self, index):
+        if self._strings is None:
+            self._strings = []
+            if "xl/sharedStrings.xml" in self.archive.namelist():
+                with self.archive.open("xl/sharedStrings.xml") as f:
+                    for _, elem in ET.iterparse(f):
+                        if elem.tag == f"{{{MAIN_NS}}}si":
+                            self._strings.append("".join(
+                                t.text or "" for t in elem.iter(f"{{{MAIN_NS}}}t")))
+                            elem.clear()
+        return self._strings[index]
+
+def cell_text(attributes, content, shared_strings):
+    """セルの値を文字列で返す"""
+    if content is None:
+        return ""
+    match = CELL_TYPE_RE.search(attributes)
+    cell_type = match.group(1) if match else b"n"
+    if cell_type == b"inlineStr":
+        return unescape(b"".join(TEXT_RE.findall(content)).decode("utf-8"))
+    match = VALUE_RE.search(content)
+    if not match:
+        return ""
+    value = unescape(match.group(1).decode("utf-8"))
+    if cell_type == b"s":
+        return shared_strings[int(value)]
+    return value
+
+def result_cells(row_number, values, styles):
+    """結果列のセルのXMLを返す（値が None のセルは出力しない）"""
+    cells = []
+    for offset, (value, style) in enumerate(zip(values, styles)):
+        if value is None:
+            continue
+        ref = f"{column_letter(FIRST_RESULT_COLUMN + offset)}{row_number}"
+        style_attr = f' s="{style.decode()}"' if style else ""
+        if isinstance(value, (int, float)):
+            xml = f'<c r="{ref}"{style_attr}><v>{value}</v></c>'
+        else:
+            xml = f'<c r="{ref}"{style_attr} t="inlineStr"><is><t>{escape(value)}</t></is></c>'
+        cells.append((FIRST_RESULT_COLUMN + offset, xml.encode("utf-8")))
+    return cells
+
+def patch_row(row_xml, results, state, shared_strings):
+    """1行分の <row> 要素を書き換えて返す（対象外の行はそのまま返す）"""
+    tag_end = row_xml.index(b">") + 1
+    open_tag = row_xml[:tag_end]
+    if open_tag.endswith(b"/>"):
+        return row_xml
+
+    cells = [(column_index(CELL_REF_RE.search(m.group(1)).group(1)), m)
+             for m in CELL_RE.finditer(row_xml, tag_end)]
+    first = cells[0][1] if cells and cells[0][0] == 1 else None
+    no = cell_text(first.group(1), first.group(2), shared_strings) if first else ""
+
+    if not state["header_seen"]:
+        if no != "No":
+            return row_xml
+        state["header_seen"] = True
+        values = RESULT_HEADERS
+        style = CELL_STYLE_RE.search(first.group(1))
+        styles = [style.group(1) if style else None] * len(RESULT_HEADERS)
+    else:
+        result = results.pop(no, None)
+        if result is None:
+            return row_xml
+        values = [RESULT_LABELS.get(result["result"], result["result"]),
+                  result.get("elapsed_ms"), result.get("detail") or None]
+        # 結果・実行時間は No 列（中央揃え）、詳細は テスト項目 列（左揃え）のスタイルに合わせる
+        center = CELL_STYLE_RE.search(first.group(1))
+        left = next((CELL_STYLE_RE.search(m.group(1)) for col, m in cells if col == 2), None)
+        center = center.group(1) if center else None
+        left = left.group(1) if left else None
+        styles = [center, center, left]
+
+    row_number = ROW_NUMBER_RE.search(open_tag).group(1).decode()
+    last_column = FIRST_RESULT_COLUMN + len(RESULT_HEADERS) - 1
+    kept = [(col, m.group(0)) for col, m in cells
+            if not FIRST_RESULT_COLUMN <= col <= last_column]
+    kept.extend(result_cells(row_number, values, styles))
+    kept.sort(key=lambda cell: cell[0])
+    state["patched"] += 1
+    return ROW_SPANS_RE.sub(b"", open_tag) + b"".join(xml for _, xml in kept) + b"</row>"
+
+def patch_head(head):
+    """<sheetData> より前の部分の範囲（dimension）と列幅（cols）に結果列を加える"""
+    last_column = FIRST_RESULT_COLUMN + len(RESULT_HEADERS) - 1
+
+    def widen(match):
+        if column_index(match.group(2)) >= last_column:
+            return match.group(0)
+        return match.group(1) + column_letter(last_column).encode() + match.group(3)
+
+    head = DIMENSION_RE.sub(widen, head, count=1)
+
+    covered = set()
+    for match in COL_RANGE_RE.finditer(head):
+        low, high = (match.group(1), match.group(2)) if match.group(1) else (match.group(4), match.group(3))
+        covered.update(range(int(low), int(high) + 1))
+    cols = b"".join(
+        f'<col width="{width}" customWidth="1" min="{col}" max="{col}" />'.encode()
+        for col, width in enumerate(RESULT_WIDTHS, FIRST_RESULT_COLUMN) if col not in covered)
+    if not cols:
+        return head
+    if b"</cols>" in head:
+        return head.replace(b"</cols>", cols + b"</cols>", 1)
+    index = head.rindex(b"<sheetData")
+    return head[:index] + b"<cols>" + cols + b"</cols>" + head[index:]
+
+def patch_sheet(src, dst, results, shared_strings):
+    """シートXMLを少しずつ読みながら、結果のある行だけを書き換えて dst に書き出す
+
+    メモリに保持するのは読み込み途中の1行分だけなので、シートの大きさに依存しない。
+    戻り値は書き換えた行数（見出し行を含む）。
+    """
+    state = {"header_seen": False, "patched": 0}
+    buf = b""
+    eof = False
+
+    # <sheetData> の開始タグまでを読み、範囲と列幅を書き換える
+    while not eof:
+        chunk = src.read(CHUNK_SIZE)
+        eof = not chunk
+        buf += chunk
+        start = buf.find(b"<sheetData")
+        if start >= 0 and buf.find(b">", start) >= 0:
+            end = buf.find(b">", start) + 1
+            if buf[end - 2:end] == b"/>":
+                # 行のないシート
+                dst.write(buf)
+                shutil.copyfileobj(src, dst)
+                return 0
+            dst.write(patch_head(buf[:end]))
+            buf = buf[end:]
+            break
+
+    while True:
+        match = ROW_START_RE.search(buf)
+        if match is None:
+            if eof:
+                dst.write(buf)
+                break
+            # "<row" が読み込みの境界で切れている場合に備えて末尾を残す
+            keep = len(buf) - 5
+            if keep > 0:
+                dst.write(buf[:keep])
+                buf = buf[keep:]
+        else:
+            tag_end = buf.find(b">", match.start())
+            if tag_end >= 0 and buf[tag_end - 1:tag_end] == b"/":
+                end = tag_end + 1
+            else:
+                end = buf.find(b"</row>", match.start())
+                end = end + len(b"</row>") if end >= 0 else -1
+            if tag_end >= 0 and end >= 0:
+                dst.write(buf[:match.start()])
+                dst.write(patch_row(buf[match.start():end], results, state, shared_strings))
+                buf = buf[end:]
+                continue
+            if eof:
+                raise ValueError("シートXMLの <row> 要素が閉じていません")
+
+        chunk = src.read(CHUNK_SIZE)
+        eof = not chunk
+        buf += chunk
+    return state["patched"]
+
+def copy_compressed(src, dst, item):
+    """src のパーツ item を、展開・再圧縮せずに圧縮されたままのバイト列で dst にコピーする"""
+    src.fp.seek(item.header_offset)
+    header = src.fp.read(zipfile.sizeFileHeader)
+    if header[:4] != zipfile.stringFileHeader:
+        raise zipfile.BadZipFile(f"パーツのヘッダーが壊れています: {item.filename}")
+    name_length, extra_length = struct.unpack("<HH", header[26:30])
+    src.fp.seek(item.header_offset + zipfile.sizeFileHeader + name_length + extra_length)
+
+    info = zipfile.ZipInfo(item.filename, date_time=item.date_time)
+    info.compress_type = item.compress_type
+    info.external_attr = item.external_attr
+    info.CRC, info.compress_size, info.file_size = item.CRC, item.compress_size, item.file_size
+    dst.fp.seek(dst.start_dir)
+    info.header_offset = dst.fp.tell()
+    dst.fp.write(info.FileHeader())
+    remaining = item.compress_size
+    while remaining:
+        chunk = src.fp.read(min(CHUNK_SIZE, remaining))
+        if not chunk:
+            raise zipfile.BadZipFile(f"パーツが途中で終わっています: {item.filename}")
+        dst.fp.write(chunk)
+        remaining -= len(chunk)
+    dst.start_dir = dst.fp.tell()
+    dst.filelist.append(info)
+    dst.NameToInfo[info.filename] = info
+
+def write_back_results(filename, results):
+    """実行結果を filename のワークブックに書き込み、書き換えた行数を返す
+
+    results は testcases.runner の結果（sheet, no, result, elapsed_ms, detail を持つ辞書）。
+    """
+    by_sheet = {}
+    for result in results:
+        by_sheet.setdefault(result["sheet"], {})[str(result["no"])] = result
+
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, tmp_path = tempfile.mkstemp(suffix=".xlsx", dir=directory)
+    os.close(fd)
+    patched = 0
+    try:
+        with zipfile.ZipFile(filename) as src, zipfile.ZipFile(tmp_path, "w") as dst:
+            parts = worksheet_parts(src)
+            unknown = [title for title in by_sheet if title not in parts]
+            if unknown:
+                raise ValueError(f"ワークブックに存在しないシートです: {', '.join(unknown)}")
+            targets = {parts[title]: rows for title, rows in by_sheet.items()}
+            shared_strings = SharedStrings(src)
+
+            for item in src.infolist():
+                if item.filename not in targets:
+                    copy_compressed(src, dst, item)
+                    continue
+                # 書き換えるシートのXMLだけを展開し、書き換えながら圧縮し直す
+                info = zipfile.ZipInfo(item.filename, date_time=item.date_time)
+                info.compress_type = item.compress_type
+                info.external_attr = item.external_attr
+                with src.open(item) as part, dst.open(info, "w", force_zip64=True) as out:
+                    patched += patch_sheet(part, out, targets[item.filename], shared_strings)
+
+        missing = sum(len(rows) for rows in targets.values())
+        if missing:
+            print(f"⚠️ ワークブックに見つからなかった行: {missing}件", file=sys.stderr)
+        os.replace(tmp_path, filename)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return patched
+
+def load_results(path):
+    """JSON Lines の実行結果を1件ずつ返す"""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def main():
+    parser = argparse.ArgumentParser(description="テストケースの実行結果をワークブックに書き込みます")
+    parser.add_argument("results", help="testcases.runner --results で書き出した JSON Lines ファイル")
+    parser.add_argument("-w", "--workbook", default=DEFAULT_WORKBOOK, help="書き込み先のワークブック")
+    args = parser.parse_args()
+
+    try:
+        patched = write_back_results(args.workbook, load_results(args.results))
+    except (OSError, ValueError, zipfile.BadZipFile) as e:
+        parser.error(str(e))
+    print(f"✅ 実行結果を書き込みました（{patched}行）: {args.workbook}")
+
+if __name__ == "__main__":
+    main()
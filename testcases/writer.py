@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+テストケースのワークブックへの書き出し
+
+カタログのシートを1プロセスで1つのワークブックに書き出す。通常のワークブックのほか、
+書き込み専用ワークブックに1行ずつ書き出すストリーミングモードがあり、
+こちらは行数に関わらずメモリ使用量が一定になる。
+"""
+
+import os
+import shutil
+import tempfile
+import zipfile
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+
+from testcases.catalog import HEADERS, select_sheets
+from testcases.profiling import NULL_PROFILER
+from testcases.styles import (
+    CENTER_COLUMNS,
+    CENTER_STYLE,
+    HEADER_STYLE,
+    LEFT_STYLE,
+    register_named_styles,
+    set_column_widths,
+)
+from testcases.widths import ColumnSizer, replace_cols_xml
+
+OUTPUT_FILENAME = "単体テストケース一覧.xlsx"
+
+def create_test_cases_excel(filename=OUTPUT_FILENAME, streaming=False, sheets=None,
+                            profiler=NULL_PROFILER):
+    """テストケースExcelファイルを作成
+
+    sheets にはカタログのシート（testcases.catalog.CatalogSheet）を宣言順に渡す。
+    省略した場合はカタログ内の全シートを出力する。
+    streaming=True の場合は書き込み専用ワークブックを使い、
+    テストケースを1行ずつ書き出すため、行数に関わらずメモリ使用量が一定になる。
+    列幅は書き出しながら測った内容の表示幅から決める。
+    profiler には testcases.profiling.Profiler を渡すと、フェーズごとに計測する。
+    """
+    if sheets is None:
+        sheets = select_sheets()
+
+    wb = Workbook(write_only=streaming)
+
+    # デフォルトシートを削除
+    if 'Sheet' in wb.sheetnames:
+        wb.remove(wb['Sheet'])
+
+    # スタイル定義
+    register_named_styles(wb)
+
+    write_sheet = write_sheet_streaming if streaming else write_sheet_normal
+    widths_by_part = {}
+    for idx, sheet in enumerate(sheets, 1):
+        ws = wb.create_sheet(sheet.title)
+        # 行は読み込みながら書き込む（カタログ読み込みの時間は collect が分けて記録する）
+        test_cases = profiler.collect(sheet.test_cases(), sheet.key)
+        sizer = ColumnSizer(HEADERS)
+        with profiler.phase("セル書き込み", sheet.key) as record:
+            _, record["cells"], record["style_applications"] = write_sheet(ws, sizer.track(test_cases))
+        with profiler.phase("列幅設定", sheet.key):
+            if streaming:
+                widths_by_part[f"xl/worksheets/sheet{idx}.xml"] = sizer.column_widths()
+            else:
+                set_column_widths(ws, sizer.column_widths())
+
+    # ファイル保存
+    with profiler.phase("保存"):
+        if streaming:
+            # 書き込み専用シートの列幅は行より前に書き出されるため、保存後に差し替える
+            with tempfile.TemporaryDirectory() as tmpdir:
+                saved = os.path.join(tmpdir, "streaming.xlsx")
+                wb.save(saved)
+                apply_column_widths(saved, filename, widths_by_part)
+        else:
+            wb.save(filename)
+    mode = "（ストリーミング）" if streaming else ""
+    print(f"✅ テストケースExcelファイルを作成しました{mode}: {filename}")
+
+def apply_column_widths(src_path, filename, widths_by_part):
+    """src_path のワークブックを filename にコピーし、シートXMLの列幅を差し替える"""
+    with zipfile.ZipFile(src_path) as src, \
+            zipfile.ZipFile(filename, "w", zipfile.ZIP_DEFLATED) as dst:
+        for item in src.infolist():
+            with src.open(item) as part, dst.open(item.filename, "w", force_zip64=True) as out:
+                if item.filename in widths_by_part:
+                    replace_cols_xml(part, out, widths_by_part[item.filename])
+                else:
+                    shutil.copyfileobj(part, out)
+
+def write_sheet_normal(ws, test_cases):
+    """通常のシートにヘッダーとテストケースを書き込み、
+    (テストケースの行数, 書き込んだセル数, スタイルを適用した回数) を返す"""
+    ws.append(HEADERS)
+    cells = len(HEADERS)
+
+    # ヘッダーのスタイル設定
+    styled = 0
+    for cell in ws[1]:
+        cell.style = HEADER_STYLE
+        styled += 1
+
+    rows = 0
+    for row_num, test_case in enumerate(test_cases, 2):
+        for col_num, value in enumerate(test_case, 1):
+            cell = ws.cell(row=row_num, column=col_num, value=value)
+            cell.style = CENTER_STYLE if col_num in CENTER_COLUMNS else LEFT_STYLE
+            styled += 1
+        cells += len(test_case)
+        rows += 1
+    return rows, cells, styled
+
+def write_sheet_streaming(ws, test_cases):
+    """書き込み専用シートにヘッダーとテストケースを1行ずつ書き出し、
+    (テストケースの行数, 書き込んだセル数, スタイルを適用した回数) を返す"""
+    header_row = []
+    styled = 0
+    for header in HEADERS:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.style = HEADER_STYLE
+        styled += 1
+        header_row.append(cell)
+    ws.append(header_row)
+    cells = len(header_row)
+
+    rows = 0
+    for test_case in test_cases:
+        row = []
+        for col_num, value in enumerate(test_case, 1):
+            cell = WriteOnlyCell(ws, value=value)
+            cell.style = CENTER_STYLE if col_num in CENTER_COLUMNS else LEFT_STYLE
+            styled += 1
+            row.append(cell)
+        ws.append(row)
+        cells += len(row)
+        rows += 1
+    return rows, cells, styled
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""testcases.duplicates の検出漏れと、まとまりのつながり方のテスト
+
+    python -m pytest tests/test_duplicates.py
+"""
+
+import random
+
+from testcases.duplicates import MAX_BUCKET_LEADERS, find_duplicates
+
+EMAIL_EMPTY = "email: 空, password: 'test123', name: 'テスト太郎'"
+REQUIRED_ERROR = "エラー: メールアドレス、パスワード、名前は必須です"
+
+class Sheet:
+
+    def __init__(self, title, rows):
+        self.title = title
+        self.rows = rows
+
+    def test_cases(self):
+        for no, (item, inputs, expected) in enumerate(self.rows, 1):
+            yield [str(no), item, "単項目", "なし", inputs, expected, ""]
+
+def unrelated_items(count, seed=0):
+    """互いに似ていないテスト項目（ランダムなカタカナ12文字）"""
+    rng = random.Random(seed)
+    return ["".join(chr(rng.randrange(0x30A2, 0x30F3)) for _ in range(12)) for _ in range(count)]
+
+def cluster_of(clusters, sheet, no):
+    for cluster in clusters:
+        if any(row["sheet"] == sheet and row["no"] == no for row in cluster["rows"]):
+            return cluster
+    return None
+
+def test_finds_near_duplicates_behind_full_buckets():
+    # 入力データと期待結果が同じで、テスト項目が似ていない行を上限より多く並べ、
+    # 入力データと期待結果の帯を候補の数え上げに使われない状態にする
+    filler = [(item, EMAIL_EMPTY, REQUIRED_ERROR) for item in unrelated_items(MAX_BUCKET_LEADERS * 3)]
+    first = Sheet("ユーザー登録", filler + [("メールアドレス未入力で登録ボタンを押す", EMAIL_EMPTY, REQUIRED_ERROR)])
+    second = Sheet("スタイリスト申請", filler[:10] + [
+        ("メールアドレス未入力で登録ボタンを押下", EMAIL_EMPTY, REQUIRED_ERROR)])
+
+    clusters, skipped = find_duplicates([first, second])
+
+    assert skipped["buckets"] > 0
+    cluster = cluster_of(clusters, "ユーザー登録", str(len(filler) + 1))
+    assert cluster is not None
+    assert {"sheet": "スタイリスト申請", "no": "11", "item": "メールアドレス未入力で登録ボタンを押下"} in cluster["rows"]
+
+def test_exact_duplicates_are_grouped():
+    rows = [("メールアドレス未入力", EMAIL_EMPTY, REQUIRED_ERROR)]
+    clusters, _ = find_duplicates([Sheet("A", rows), Sheet("B", rows)])
+
+    assert [(cluster["kind"], cluster["sheets"], len(cluster["rows"])) for cluster in clusters] == [("exact", 2, 2)]
+
+def test_rows_are_not_chained_through_a_middle_row():
+    # b は a にも c にも似ているが、a と c は似ていない。代表（a）との類似度だけで
+    # まとめるため、c は a のまとまりに入らない
+    a = ("メールアドレス未入力で登録ボタンを押す", EMAIL_EMPTY, REQUIRED_ERROR)
+    b = ("メールアドレスを未入力のまま登録ボタンを押す", EMAIL_EMPTY, REQUIRED_ERROR)
+    c = ("未入力のまま登録ボタンを押す", EMAIL_EMPTY, REQUIRED_ERROR)
+    clusters, _ = find_duplicates([Sheet("A", [a, b, c])])
+
+    cluster = cluster_of(clusters, "A", "1")
+    assert [row["no"] for row in cluster["rows"]] == ["1", "2"]